@@ -1,8 +1,15 @@
 import json
 import os
 
+from build_io import write_json_output
+from question_extractor import assign_question_ids
+
 def add_ids_to_questions():
-    """Add unique IDs to all questions in questions.json"""
+    """Add stable IDs to all questions in questions.json
+
+    process_excel.py already assigns IDs during extraction; this only
+    migrates a questions.json built by an older version of it.
+    """
     
     questions_file = 'public/questions.json'
     
@@ -17,13 +24,13 @@ def add_ids_to_questions():
         
         print(f"Loaded {len(questions)} questions")
         
-        # Add IDs to each question
-        for i, question in enumerate(questions):
-            question['id'] = i + 1  # Start from 1
+        # Add content-derived IDs to each question
+        id_collisions = assign_question_ids(questions)
+        for collision in id_collisions:
+            print(f"ID collision: {collision}")
         
-        # Save back to file
-        with open(questions_file, 'w', encoding='utf-8') as f:
-            json.dump(questions, f, ensure_ascii=False, indent=2)
+        # Save back via a temp file, so the app never reads a half-written bank
+        write_json_output(questions_file, questions)
         
         print(f"Successfully added IDs to {len(questions)} questions")
         print(f"Updated file: {questions_file}")
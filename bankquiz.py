@@ -0,0 +1,135 @@
+import argparse
+import os
+import sys
+
+# Import time allowed before a command starts its own work: the dispatcher
+# plus the module the command runs, measured under python -X importtime
+# (modules the bare interpreter imports anyway are not counted); pandas
+# alone takes ~300 ms
+STARTUP_BUDGET_MS = 100
+# Modules only the commands that actually use them may import
+HEAVY_MODULES = ('openpyxl', 'pandas', 'numpy')
+STARTUP_RUNS = 3
+
+COMMANDS = {
+    'extract': "extract questions from public/xlsx (options: bankquiz extract --help)",
+    'ids': "add stable IDs to an existing public/questions.json",
+    'inspect': "stream and filter questions.json (options: bankquiz inspect --help)",
+    'debug-rows': "print every row of a workbook and each extraction step",
+    'debug-colors': "print the column E fill colours of a workbook's questions",
+    'rows': "print a row range of a workbook with fill colours (options: bankquiz rows --help)",
+}
+
+def run_extract(argv):
+    from process_excel import main
+    main(argv, prog='bankquiz extract')
+
+def run_inspect(argv):
+    from process_questions import main
+    main(argv, prog='bankquiz inspect')
+
+def run_rows(argv):
+    from sheet_inspector import main
+    main(argv, prog='bankquiz rows')
+
+# The module each command imports to do its work, timed by check-startup
+COMMAND_MODULES = {
+    'extract': 'process_excel',
+    'ids': 'add_ids_to_questions',
+    'inspect': 'process_questions',
+    'debug-rows': 'question_extractor',
+    'debug-colors': 'debug_background_colors',
+    'rows': 'sheet_inspector',
+}
+
+# These commands parse their own options, so everything after the command name is theirs
+PASSTHROUGH_COMMANDS = {'extract': run_extract, 'inspect': run_inspect, 'rows': run_rows}
+
+def run_ids(args):
+    from add_ids_to_questions import add_ids_to_questions
+    add_ids_to_questions()
+
+def run_debug_rows(args):
+    from question_extractor import debug_workbook
+    debug_workbook(args.file)
+
+def run_debug_colors(args):
+    from debug_background_colors import debug_background_colors
+    debug_background_colors(args.file)
+
+def parse_importtime(stderr):
+    """Return {module: cumulative microseconds} for the top-level imports in -X importtime output"""
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        _, cumulative, name = line.split('|')
+        # Nested imports are indented by two more spaces per level
+        if cumulative.strip().isdigit() and not name.startswith('   '):
+            times[name.strip()] = int(cumulative)
+    return times
+
+def startup_imports(modules):
+    """Import modules under -X importtime in a fresh interpreter; return (top-level times, every module)"""
+    import subprocess
+    code = f"import {', '.join(modules)}" if modules else 'pass'
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], capture_output=True, text=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__)))
+    if result.returncode != 0:
+        raise SystemExit(f"{code} failed:\n{result.stderr.splitlines()[-1]}")
+    imported = {line.rsplit('|', 1)[-1].strip() for line in result.stderr.splitlines()
+                if line.startswith('import time:')}
+    return parse_importtime(result.stderr), imported
+
+def run_check_startup(args):
+    """Measure every command's import time against the budget; exit 1 when one exceeds it"""
+    baseline, _ = startup_imports([])
+    failed = False
+    checks = [('', ['bankquiz'])] + [(name, ['bankquiz', COMMAND_MODULES[name]]) for name in COMMANDS]
+    for command, modules in checks:
+        best = None
+        for _ in range(STARTUP_RUNS):
+            times, imported = startup_imports(modules)
+            total = sum(us for module, us in times.items() if module not in baseline) / 1000
+            best = total if best is None else min(best, total)
+        heavy = sorted({module.split('.')[0] for module in imported} & set(HEAVY_MODULES))
+        status = "OVER BUDGET" if best > args.budget else "ok"
+        if heavy:
+            status += f", imports {', '.join(heavy)}"
+        failed = failed or best > args.budget or bool(heavy)
+        print(f"  bankquiz {command:<14} {best:>6.1f} ms  {status}  ({modules[-1]})")
+    print(f"Budget: {args.budget:.0f} ms of imports per command, best of {STARTUP_RUNS} runs")
+    if failed:
+        sys.exit(1)
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='bankquiz', description="Question bank command-line tools")
+    commands = parser.add_subparsers(dest='command', required=True, metavar='command')
+    for name in PASSTHROUGH_COMMANDS:
+        # Listed for --help only; main() hands their arguments over unparsed
+        commands.add_parser(name, help=COMMANDS[name], add_help=False)
+    commands.add_parser('ids', help=COMMANDS['ids']).set_defaults(handler=run_ids)
+    debug_rows = commands.add_parser('debug-rows', help=COMMANDS['debug-rows'])
+    debug_rows.add_argument('file', help="workbook, e.g. public/xlsx/6.2.xlsx")
+    debug_rows.set_defaults(handler=run_debug_rows)
+    debug_colors = commands.add_parser('debug-colors', help=COMMANDS['debug-colors'])
+    debug_colors.add_argument('file', nargs='?', default='public/xlsx/6.4.xlsx',
+                              help="workbook (default: %(default)s)")
+    debug_colors.set_defaults(handler=run_debug_colors)
+    check = commands.add_parser('check-startup', help="check every command's import time with python -X importtime")
+    check.add_argument('--budget', type=float, default=STARTUP_BUDGET_MS,
+                       help="allowed import time per command in ms (default: %(default)s)")
+    check.set_defaults(handler=run_check_startup)
+    return parser
+
+def main(argv=None):
+    """Dispatch to a subcommand; heavy modules are imported only by the command that runs"""
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] in PASSTHROUGH_COMMANDS:
+        PASSTHROUGH_COMMANDS[argv[0]](argv[1:])
+        return
+    args = build_parser().parse_args(argv)
+    args.handler(args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+import argparse
+import json
+import os
+import platform
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+BENCH_DIR = '.cache/bench'
+DEFAULT_SIZES = [1000, 10000, 100000]
+QUESTIONS_PER_GROUP = 20
+
+# Armenian words to build strings with the same UTF-8 weight as the real bank
+WORDS = ['Համաձայն', 'բանկի', 'հաճախորդի', 'կանոնակարգ', 'պատասխանը', 'ներքին', 'իրավական',
+         'ակտերի', 'ծառայությունների', 'բողոքը', 'ֆինանսական', 'կազմակերպության', 'գրավոր',
+         'ներկայացված', 'պահանջ', 'ավանդների', 'կողմից', 'որակի', 'հետ', 'և', 'չի', 'է']
+
+def synthetic_text(rng, words):
+    """Return a pseudo-sentence of the given number of words"""
+    return ' '.join(rng.choice(WORDS) for _ in range(words))
+
+def generate_workbook(path, questions, seed=0):
+    """Write a workbook in the bank layout with the given number of questions.
+
+    Row 1 is a header.  Each question has its group title in column B, the
+    question in column E (red fill, like the real files) and four answers in
+    column E below it, the correct one with the yellow highlight.  Rows are
+    streamed with a write-only workbook so 100k questions fit in memory.
+    """
+    import openpyxl
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import PatternFill
+
+    rng = random.Random(seed)
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet()
+    question_fill = PatternFill(fill_type='solid', fgColor='FFFF0000')
+    correct_fill = PatternFill(fill_type='solid', fgColor='FFFFFF00')
+
+    def text_cell(value, fill=None):
+        cell = WriteOnlyCell(ws, value=value)
+        if fill is not None:
+            cell.fill = fill
+        return cell
+
+    ws.append(['#', 'Group', None, None, 'Text'])
+    group_title = None
+    for i in range(questions):
+        if i % QUESTIONS_PER_GROUP == 0:
+            group_title = f"{i // QUESTIONS_PER_GROUP + 1}. {synthetic_text(rng, 8)}"
+        # The extractor expects the group title in column B before every question
+        ws.append([None, group_title])
+        ws.append([None, None, None, None, text_cell(f"Նշել ճիշտ պատասխանը. {synthetic_text(rng, 14)}", question_fill)])
+        correct = rng.randrange(4)
+        for j in range(4):
+            ws.append([None, None, None, None,
+                       text_cell(synthetic_text(rng, 7), correct_fill if j == correct else None)])
+        ws.append([])
+    wb.save(path)
+
+def ensure_workbook(questions, bench_dir=BENCH_DIR, regenerate=False):
+    """Return the path of the synthetic workbook with that many questions, generating it if needed"""
+    os.makedirs(bench_dir, exist_ok=True)
+    path = os.path.join(bench_dir, f"synthetic-{questions}.xlsx")
+    if regenerate or not os.path.exists(path):
+        start = time.perf_counter()
+        generate_workbook(path, questions)
+        print(f"Generated {path} in {time.perf_counter() - start:.1f}s")
+    return path
+
+def peak_rss_bytes():
+    """Return this process's peak resident set size in bytes, or None if unknown"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return peak if platform.system() == 'Darwin' else peak * 1024
+
+def run_once(path):
+    """Extract, assign IDs and serialize one workbook; runs in a fresh process so RSS is per run"""
+    from build_profile import StageProfiler
+    from process_excel import assign_question_ids, encode_json, extract_questions_from_file
+
+    profiler = StageProfiler()
+    start = time.perf_counter()
+    cpu_start = time.process_time()
+    questions, issues, error, stages = extract_questions_from_file(path, profile=True)
+    profiler.merge(stages)
+    with profiler.stage('assign_ids'):
+        assign_question_ids(questions)
+    with profiler.stage('serialize'):
+        payload = encode_json(questions)
+    return {
+        "wall": time.perf_counter() - start,
+        "cpu": time.process_time() - cpu_start,
+        "questions": len(questions),
+        "issues": len(issues),
+        "error": error,
+        "outputBytes": len(payload),
+        "peakRss": peak_rss_bytes(),
+        "stages": {total["stage"]: round(total["wall"], 6) for total in profiler.totals()}
+    }
+
+def run_benchmark(sizes, repeat=3, regenerate=False):
+    """Benchmark extraction for each size and return a JSON-serializable report.
+
+    Every run uses a new process so peak RSS is not inflated by earlier
+    runs; the best wall time of the repeats is reported.
+    """
+    from build_log import configure_logging
+
+    configure_logging('quiet')
+    results = []
+    for size in sizes:
+        path = ensure_workbook(size, regenerate=regenerate)
+        runs = []
+        for _ in range(repeat):
+            with ProcessPoolExecutor(max_workers=1) as executor:
+                runs.append(executor.submit(run_once, path).result())
+        best = min(runs, key=lambda run: run["wall"])
+        if best["error"] or best["questions"] != size:
+            print(f"Warning: {size} questions expected, got {best['questions']} (error: {best['error']})")
+        results.append({
+            "size": size,
+            "workbookBytes": os.path.getsize(path),
+            "questions": best["questions"],
+            "wall": round(best["wall"], 6),
+            "cpu": round(best["cpu"], 6),
+            "questionsPerSecond": round(best["questions"] / best["wall"], 1) if best["wall"] else None,
+            "peakRss": max(run["peakRss"] or 0 for run in runs) or None,
+            "stages": best["stages"],
+            "runs": [round(run["wall"], 6) for run in runs]
+        })
+    return {
+        "benchmark": "ingestion",
+        "createdAt": time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "repeat": repeat,
+        "results": results
+    }
+
+def print_report(report, baseline=None):
+    """Print the results as a table, with the speedup over a baseline report if given"""
+    baseline_results = {result["size"]: result for result in (baseline or {}).get("results", [])}
+    print(f"{'questions':>10}{'wall s':>10}{'q/s':>12}{'peak RSS MiB':>14}{'vs baseline':>13}")
+    for result in report["results"]:
+        rss = f"{result['peakRss'] / 1048576:>14.1f}" if result["peakRss"] else f"{'-':>14}"
+        previous = baseline_results.get(result["size"])
+        speedup = f"{previous['wall'] / result['wall']:>12.2f}x" if previous and result["wall"] else f"{'-':>13}"
+        print(f"{result['size']:>10}{result['wall']:>10.3f}{result['questionsPerSecond']:>12,.0f}{rss}{speedup}")
+
+def main():
+    """Generate synthetic workbooks and benchmark the ingestion path on them"""
+    parser = argparse.ArgumentParser(description="Benchmark workbook ingestion on synthetic workbooks")
+    parser.add_argument('--sizes', default=','.join(str(size) for size in DEFAULT_SIZES),
+                        help="comma-separated question counts (default: %(default)s)")
+    parser.add_argument('--repeat', type=int, default=3, help="runs per size, best is reported (default: 3)")
+    parser.add_argument('--regenerate', action='store_true', help=f"rebuild the workbooks in {BENCH_DIR}")
+    parser.add_argument('--output', metavar='PATH', help="write the results as JSON to PATH")
+    parser.add_argument('--compare', metavar='PATH', help="show the speedup over an earlier --output file")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(',') if size]
+    report = run_benchmark(sizes, repeat=args.repeat, regenerate=args.regenerate)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Results saved to: {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+import gzip
+import hashlib
+import json
+import os
+
+def encode_json(data, minify=False):
+    """Serialize data the way the build writes it: indented, or compact when minify is set"""
+    if minify:
+        return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+
+def atomic_write(path, payload):
+    """Write bytes via a temp file in the same directory and rename it into place.
+
+    Readers (the dev server, the API server, a browser) see either the old
+    or the new file, never a partially written one.  The temp file is named
+    after the process, so concurrent builds never share one, and it is
+    removed again if the write fails.
+    """
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def write_json_output(path, data, production=False):
+    """Write a JSON build artifact and return its size report.
+
+    In production mode the JSON is minified and .gz and .br siblings are
+    written at maximum compression; .br is skipped when the optional brotli
+    package is not installed.  The report holds raw (indented), minified and
+    compressed byte counts and the SHA-256 of the file as written.
+    """
+    payload = encode_json(data, minify=production)
+    atomic_write(path, payload)
+    
+    report = {"file": path, "raw": len(payload), "sha256": hashlib.sha256(payload).hexdigest()}
+    if not production:
+        # Drop compressed siblings of an earlier production build, they are stale now
+        for sibling in (path + '.gz', path + '.br'):
+            if os.path.exists(sibling):
+                os.remove(sibling)
+        return report
+    
+    report["raw"] = len(encode_json(data))
+    report["minified"] = len(payload)
+    
+    # mtime=0 keeps the .gz byte-identical across rebuilds of the same data
+    compressed = gzip.compress(payload, compresslevel=9, mtime=0)
+    atomic_write(path + '.gz', compressed)
+    report["gzip"] = len(compressed)
+    
+    try:
+        import brotli
+    except ImportError:
+        brotli = None
+    if brotli is not None:
+        compressed = brotli.compress(payload, quality=11)
+        atomic_write(path + '.br', compressed)
+        report["brotli"] = len(compressed)
+    return report
+
+def file_sha256(path):
+    """Return the hex SHA-256 of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
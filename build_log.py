@@ -0,0 +1,71 @@
+import json
+import logging
+import sys
+
+# Below DEBUG: one record per row/group/question/answer seen by the extractor
+TRACE = 5
+logging.addLevelName(TRACE, 'TRACE')
+
+VERBOSITY_LEVELS = {
+    'quiet': logging.WARNING,   # problems only
+    'summary': logging.INFO,    # per-file progress and the final summary
+    'trace': TRACE              # every extraction step
+}
+
+logger = logging.getLogger('bankquiz')
+
+# Arguments of the last configure_logging() call, handed on to worker processes
+_config = ('summary', None)
+
+class JsonLinesFormatter(logging.Formatter):
+    """Format records as one JSON object per line, including their structured fields"""
+
+    def format(self, record):
+        entry = {
+            "time": round(record.created, 6),
+            "level": record.levelname,
+            "event": getattr(record, 'event', None),
+            "message": record.getMessage()
+        }
+        entry.update(getattr(record, 'fields', {}))
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+def configure_logging(verbosity='summary', json_file=None):
+    """Send build logs to stdout at the given verbosity, and optionally to a JSON-lines file.
+
+    Safe to call again (e.g. as a worker process initializer); existing
+    handlers are replaced.
+    """
+    global _config
+    _config = (verbosity, json_file)
+    logger.setLevel(VERBOSITY_LEVELS[verbosity])
+    logger.propagate = False
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
+
+    console = logging.StreamHandler(sys.stdout)
+    console.setFormatter(logging.Formatter('%(message)s'))
+    logger.addHandler(console)
+
+    if json_file:
+        # Append mode: worker processes write to the same file line by line
+        json_handler = logging.FileHandler(json_file, mode='a', encoding='utf-8')
+        json_handler.setFormatter(JsonLinesFormatter())
+        logger.addHandler(json_handler)
+
+def current_config():
+    """Return the (verbosity, json_file) arguments to reproduce the current setup"""
+    return _config
+
+def trace_enabled():
+    """Return True if trace records would be emitted"""
+    return logger.isEnabledFor(TRACE)
+
+def log_event(level, event, message, **fields):
+    """Log a message with an event name and structured fields for the JSON-lines output"""
+    if not logger.handlers:
+        # Used as a library without configure_logging(): default to the summary level
+        configure_logging()
+    if logger.isEnabledFor(level):
+        logger.log(level, message, extra={'event': event, 'fields': fields})
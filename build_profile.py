@@ -0,0 +1,135 @@
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+# Running peak of every open stage in this process, innermost last.  Shared by
+# all profilers because tracemalloc's peak counter is process-wide.
+_open_peaks = []
+
+class StageProfiler:
+    """Record wall time, CPU time and peak traced memory per build stage.
+
+    Stages may be nested, also across profilers in the same process; a
+    parent stage's peak includes its children.
+    Memory is only measured when trace_memory is set, because tracemalloc
+    slows allocation-heavy code down considerably.  Records are plain dicts
+    so worker processes can send theirs back to be merged.
+    """
+
+    def __init__(self, trace_memory=False):
+        self.trace_memory = trace_memory
+        self.records = []
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @contextmanager
+    def stage(self, name, workbook=None):
+        """Measure the enclosed block as one stage, optionally attributed to a workbook"""
+        if self.trace_memory:
+            if _open_peaks:
+                _open_peaks[-1] = max(_open_peaks[-1], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+            _open_peaks.append(0)
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            record = {
+                "stage": name,
+                "workbook": workbook,
+                "wall": time.perf_counter() - wall_start,
+                "cpu": time.process_time() - cpu_start,
+                "peakMemory": None
+            }
+            if self.trace_memory:
+                peak = max(_open_peaks.pop(), tracemalloc.get_traced_memory()[1])
+                record["peakMemory"] = peak
+                if _open_peaks:
+                    _open_peaks[-1] = max(_open_peaks[-1], peak)
+                tracemalloc.reset_peak()
+            self.records.append(record)
+
+    def add(self, name, wall, workbook=None):
+        """Record a stage measured by the caller (wall time only)"""
+        self.records.append({"stage": name, "workbook": workbook, "wall": wall,
+                             "cpu": None, "peakMemory": None})
+
+    def merge(self, records):
+        """Add records collected elsewhere, e.g. by a worker process"""
+        self.records.extend(records)
+
+    def totals(self):
+        """Sum wall and CPU time and take the max peak per stage name, in first-seen order"""
+        totals = {}
+        for record in self.records:
+            total = totals.setdefault(record["stage"], {"stage": record["stage"], "count": 0, "wall": 0.0,
+                                                        "cpu": None, "peakMemory": None})
+            total["count"] += 1
+            total["wall"] += record["wall"]
+            if record["cpu"] is not None:
+                total["cpu"] = (total["cpu"] or 0.0) + record["cpu"]
+            if record["peakMemory"] is not None:
+                total["peakMemory"] = max(total["peakMemory"] or 0, record["peakMemory"])
+        return list(totals.values())
+
+    def format_table(self, per_workbook=True):
+        """Return the stage totals, and optionally every per-workbook record, as table lines"""
+        def row(name, count, wall, cpu, peak):
+            cpu_text = f"{cpu * 1000:>10.1f}" if cpu is not None else f"{'-':>10}"
+            peak_text = f"{peak / 1024:>12,.0f}" if peak is not None else f"{'-':>12}"
+            return f"  {name:<32}{count:>6}{wall * 1000:>10.1f}{cpu_text}{peak_text}"
+
+        lines = [f"  {'stage':<32}{'count':>6}{'wall ms':>10}{'cpu ms':>10}{'peak KiB':>12}"]
+        for total in self.totals():
+            lines.append(row(total["stage"], total["count"], total["wall"], total["cpu"], total["peakMemory"]))
+        if per_workbook:
+            workbook_records = [record for record in self.records if record["workbook"]]
+            if workbook_records:
+                lines.append(f"  {'per workbook':<32}")
+                for record in sorted(workbook_records, key=lambda r: (r["workbook"], r["stage"])):
+                    lines.append(row(f"{record['workbook']}: {record['stage']}", 1, record["wall"],
+                                     record["cpu"], record["peakMemory"]))
+        return lines
+
+    def write_json(self, path):
+        """Write stage totals and raw records to path for comparison across runs"""
+        report = {
+            "createdAt": time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            "traceMemory": self.trace_memory,
+            "totals": self.totals(),
+            "records": self.records
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+def profile_stage(profiler, name, workbook=None):
+    """Return profiler.stage(...) or a no-op context when profiling is off"""
+    if profiler is None:
+        return nullcontext()
+    return profiler.stage(name, workbook)
+
+def timed_rows(rows, profiler, workbook):
+    """Wrap a row iterator, splitting time between producing and consuming rows.
+
+    Time spent inside the wrapped iterator is recorded as 'read_rows' and
+    time spent by the consumer between rows as 'state_machine', so the two
+    halves of one streaming loop can be told apart.
+    """
+    read_time = 0.0
+    consume_time = 0.0
+    iterator = iter(rows)
+    while True:
+        start = time.perf_counter()
+        try:
+            row = next(iterator)
+        except StopIteration:
+            read_time += time.perf_counter() - start
+            break
+        resumed = time.perf_counter()
+        read_time += resumed - start
+        yield row
+        consume_time += time.perf_counter() - resumed
+    profiler.add('read_rows', read_time, workbook)
+    profiler.add('state_machine', consume_time, workbook)
@@ -1,10 +1,9 @@
-import openpyxl
 import os
 
-def debug_background_colors():
-    """Debug background colors in 6.4.xlsx to understand correct answer detection"""
-    
-    file_path = 'public/xlsx/6.4.xlsx'
+from sheet_inspector import inspect_rows
+
+def debug_background_colors(file_path='public/xlsx/6.4.xlsx'):
+    """Debug background colors in a workbook (6.4.xlsx by default) to understand correct answer detection"""
     
     if not os.path.exists(file_path):
         print(f"File {file_path} not found!")
@@ -14,27 +13,19 @@ def debug_background_colors():
     print("=" * 80)
     
     try:
-        # Load workbook with formatting
-        wb = openpyxl.load_workbook(file_path, data_only=False)
-        ws = wb.active
+        # Values and fills of the whole sheet, from the parsed-sheet sidecar when it is current
+        rows, _ = inspect_rows(file_path, 2)
         
-        print(f"Sheet name: {ws.title}")
-        print("=" * 80)
-        
-        # Look for cells with content in column E and check their background colors
+        # Look for cells with content in column E and check their fill colours
         answer_cells = []
         
-        for row in range(2, ws.max_row + 1):
-            cell = ws.cell(row=row, column=5)  # Column E
-            if cell.value and isinstance(cell.value, str) and cell.value.strip():
-                bg_color = None
-                if cell.fill and cell.fill.bgColor:
-                    bg_color = cell.fill.bgColor.indexed
-                
+        for row, cells in sorted(rows.items()):
+            value, fill = cells.get(5, (None, None))  # Column E
+            if value and isinstance(value, str) and value.strip():
                 answer_cells.append({
                     'row': row,
-                    'value': cell.value.strip(),
-                    'bg_color': bg_color
+                    'value': value.strip(),
+                    'bg_color': fill
                 })
         
         print(f"Found {len(answer_cells)} cells with content in column E")
@@ -0,0 +1,257 @@
+import argparse
+import json
+import random
+import time
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from question_index import build_index
+
+EXAMS_FILE = 'exams.json'
+EXAMS_VERSION = 1
+PAPER_SIZE = 80
+# Candidate papers drawn per batch while filling the requested count
+BATCH_SIZE = 256
+# Give up when this many candidates in a row are rejected for overlap
+MAX_REJECTIONS = 10000
+
+def section_pools(questions):
+    """Return {section: [positions]} in section display order"""
+    pools = {}
+    for section, info in build_index(questions)['sections'].items():
+        pools[section] = [position for start, end in info['ranges'] for position in range(start, end)]
+    return pools
+
+def allocate_quotas(pools, paper_size=PAPER_SIZE):
+    """Split paper_size across sections in proportion to their size (largest remainder)"""
+    total = sum(len(pool) for pool in pools.values())
+    if paper_size > total:
+        raise ValueError(f"Paper size {paper_size} is larger than the bank ({total} questions)")
+    shares = {section: paper_size * len(pool) / total for section, pool in pools.items()}
+    quotas = {section: int(share) for section, share in shares.items()}
+    by_remainder = sorted(shares, key=lambda section: (quotas[section] - shares[section], section))
+    for section in by_remainder[:paper_size - sum(quotas.values())]:
+        quotas[section] += 1
+    return {section: quota for section, quota in quotas.items() if quota}
+
+def parse_quotas(text, pools):
+    """Parse '1=20,2=10,...' and check every quota fits its section"""
+    quotas = {}
+    for item in text.split(','):
+        section, _, count = item.partition('=')
+        section = section.strip()
+        if section not in pools:
+            raise ValueError(f"Unknown section in quotas: {section}")
+        quotas[section] = int(count)
+    for section, quota in quotas.items():
+        if quota < 0:
+            raise ValueError(f"Quota for section {section} is negative: {quota}")
+        if quota > len(pools[section]):
+            raise ValueError(f"Section {section} has {len(pools[section])} questions, quota is {quota}")
+    if not any(quotas.values()):
+        # An empty dict would make generate_papers() fall back to the proportional split
+        raise ValueError(f"No section has a positive quota: {text}")
+    return {section: quota for section, quota in quotas.items() if quota}
+
+class PaperSampler:
+    """Draw batches of papers, each an unbiased random sample of every section's quota.
+
+    With NumPy a whole batch is drawn at once: each paper gets one random key
+    per question of a section and keeps the quota smallest keys
+    (argpartition), which selects every subset with equal probability.
+    Without NumPy random.sample is used per paper.  Question order within a
+    paper is shuffled.  The same seed and sampler reproduce the same papers.
+    """
+
+    def __init__(self, pools, quotas, seed, use_numpy=None):
+        if use_numpy is None:
+            use_numpy = np is not None
+        if use_numpy and np is None:
+            raise ValueError("NumPy is not installed; use the python sampler")
+        self.name = 'numpy' if use_numpy else 'python'
+        self.quotas = quotas
+        if use_numpy:
+            self.rng = np.random.default_rng(seed)
+            self.pools = {section: np.asarray(pools[section], dtype=np.int32) for section in quotas}
+        else:
+            self.rng = random.Random(seed)
+            self.pools = {section: pools[section] for section in quotas}
+
+    def batch(self, count):
+        """Return count papers as lists of bank positions"""
+        if self.name == 'python':
+            papers = []
+            for _ in range(count):
+                paper = []
+                for section, quota in self.quotas.items():
+                    paper.extend(self.rng.sample(self.pools[section], quota))
+                self.rng.shuffle(paper)
+                papers.append(paper)
+            return papers
+
+        parts = []
+        for section, quota in self.quotas.items():
+            pool = self.pools[section]
+            keys = self.rng.random((count, len(pool)))
+            if quota < len(pool):
+                chosen = np.argpartition(keys, quota - 1, axis=1)[:, :quota]
+            else:
+                chosen = np.broadcast_to(np.arange(len(pool)), (count, len(pool)))
+            parts.append(pool[chosen])
+        papers = self.rng.permuted(np.concatenate(parts, axis=1), axis=1)
+        return papers.tolist()
+
+class OverlapGuard:
+    """Accept papers that share at most max_overlap questions with every accepted paper.
+
+    With NumPy accepted papers are rows of a 0/1 membership matrix and one
+    column gather per candidate counts its overlap with all of them;
+    otherwise papers are bitmasks compared with popcount.  The overlaps of
+    each accepted paper with all earlier ones are exactly the pairs not yet
+    seen, so the largest and mean overlap between accepted papers are kept
+    as running totals at no extra cost.
+    """
+
+    def __init__(self, bank_size, max_overlap):
+        self.max_overlap = max_overlap
+        self.accepted = 0
+        self.largest_shared = 0
+        self.total_shared = 0
+        self.pairs = 0
+        if np is not None:
+            self.members = np.zeros((BATCH_SIZE, bank_size), dtype=np.uint8)
+        else:
+            self.masks = []
+
+    def accept(self, paper):
+        if np is None:
+            mask = 0
+            for position in paper:
+                mask |= 1 << position
+            shared = [(mask & other).bit_count() for other in self.masks]
+            if shared and max(shared) > self.max_overlap:
+                return False
+            self.masks.append(mask)
+            self.record(max(shared, default=0), sum(shared), len(shared))
+            return True
+
+        if self.accepted:
+            shared = self.members[:self.accepted, paper].sum(axis=1, dtype=np.int32)
+            if shared.max() > self.max_overlap:
+                return False
+            self.record(int(shared.max()), int(shared.sum()), self.accepted)
+        if self.accepted == len(self.members):
+            self.members = np.concatenate([self.members, np.zeros_like(self.members)])
+        self.members[self.accepted, paper] = 1
+        self.accepted += 1
+        return True
+
+    def record(self, largest, total, pairs):
+        self.largest_shared = max(self.largest_shared, largest)
+        self.total_shared += total
+        self.pairs += pairs
+
+    def stats(self):
+        """Return (max, mean) number of questions shared by two accepted papers"""
+        return self.largest_shared, self.total_shared / self.pairs if self.pairs else 0.0
+
+def generate_papers(questions, count, paper_size=PAPER_SIZE, quotas=None, seed=0,
+                    max_overlap=None, use_numpy=None):
+    """Generate count papers and return them with the settings needed to reproduce them.
+
+    quotas maps section to questions per paper and defaults to a split
+    proportional to section size.  Any two papers share at most
+    max_overlap questions (default paper_size - 1, i.e. no two papers are
+    identical); raises ValueError when the bound cannot be met.
+    """
+    pools = section_pools(questions)
+    quotas = quotas or allocate_quotas(pools, paper_size)
+    paper_size = sum(quotas.values())
+    if max_overlap is None:
+        max_overlap = paper_size - 1
+
+    sampler = PaperSampler(pools, quotas, seed, use_numpy)
+    guard = OverlapGuard(len(questions), max_overlap)
+    papers = []
+    rejections = 0
+    while len(papers) < count:
+        # Fixed-size batches: the first N papers of a seed don't depend on count
+        for paper in sampler.batch(BATCH_SIZE):
+            if guard.accept(paper):
+                papers.append(paper)
+                rejections = 0
+                if len(papers) == count:
+                    break
+            else:
+                rejections += 1
+                if rejections >= MAX_REJECTIONS:
+                    raise ValueError(f"Only {len(papers)} of {count} papers fit max overlap {max_overlap}; "
+                                     f"raise the overlap or lower the count")
+
+    largest, mean = guard.stats()
+    return {
+        "version": EXAMS_VERSION,
+        "seed": seed,
+        "sampler": sampler.name,
+        "paperSize": paper_size,
+        "quotas": quotas,
+        "maxOverlap": max_overlap,
+        "overlap": {"max": largest, "mean": mean},
+        "ids": [question['id'] for question in questions],
+        "papers": papers
+    }
+
+def load_papers(path=EXAMS_FILE):
+    """Read a papers file and return each paper as a list of question IDs"""
+    with open(path, 'r', encoding='utf-8') as f:
+        exams = json.load(f)
+    if exams.get('version') != EXAMS_VERSION:
+        raise ValueError(f"Unsupported exams version: {exams.get('version')}")
+    ids = exams['ids']
+    return [[ids[position] for position in paper] for paper in exams['papers']]
+
+def main():
+    """Generate reproducible exam papers from the built question bank"""
+    parser = argparse.ArgumentParser(description="Generate seeded, stratified exam papers")
+    parser.add_argument('-n', '--papers', type=int, default=100, help="number of papers (default: 100)")
+    parser.add_argument('--size', type=int, default=PAPER_SIZE,
+                        help=f"questions per paper, split by section size (default: {PAPER_SIZE})")
+    parser.add_argument('--quotas', help="explicit questions per section, e.g. '1=20,2=10,3=10' (overrides --size)")
+    parser.add_argument('--seed', type=int, default=0, help="random seed (default: 0)")
+    parser.add_argument('--max-overlap', type=int,
+                        help="most questions any two papers may share (default: size - 1)")
+    parser.add_argument('--sampler', choices=['auto', 'numpy', 'python'], default='auto',
+                        help="sampling backend; papers are reproducible per seed and sampler (default: auto)")
+    parser.add_argument('--questions', default='public/questions.json',
+                        help="question bank (default: %(default)s)")
+    parser.add_argument('-o', '--output', default=EXAMS_FILE, help="papers file (default: %(default)s)")
+    args = parser.parse_args()
+
+    with open(args.questions, 'r', encoding='utf-8') as f:
+        questions = json.load(f)
+
+    try:
+        quotas = parse_quotas(args.quotas, section_pools(questions)) if args.quotas else None
+        start = time.perf_counter()
+        exams = generate_papers(questions, args.papers, args.size, quotas, args.seed, args.max_overlap,
+                                use_numpy={'auto': None, 'numpy': True, 'python': False}[args.sampler])
+        elapsed = time.perf_counter() - start
+    except ValueError as e:
+        print(f"Error: {e}")
+        return
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(exams, f, separators=(',', ':'))
+
+    largest, mean = exams['overlap']['max'], exams['overlap']['mean']
+    print(f"Generated {len(exams['papers'])} papers of {exams['paperSize']} questions "
+          f"in {elapsed:.2f}s ({exams['sampler']} sampler, seed {args.seed})")
+    print(f"Questions per section: {', '.join(f'{s}={q}' for s, q in exams['quotas'].items())}")
+    print(f"Shared questions between two papers: max {largest}, mean {mean:.1f} (limit {exams['maxOverlap']})")
+    print(f"Papers saved to: {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+import argparse
+import asyncio
+import json
+import random
+import time
+from urllib.request import urlopen
+
+DEFAULT_URL = 'http://127.0.0.1:8000'
+
+def percentile(values, fraction):
+    """Return the value at a fraction (0..1) of a sorted list"""
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+async def client(host, port, paths, deadline, latencies, statuses, headers):
+    """Send requests on one keep-alive connection until the deadline"""
+    reader, writer = await asyncio.open_connection(host, port)
+    rng = random.Random()
+    try:
+        while time.perf_counter() < deadline:
+            path = rng.choice(paths)
+            start = time.perf_counter()
+            writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}\r\n{headers}\r\n".encode('latin-1'))
+            head = await reader.readuntil(b'\r\n\r\n')
+            status = int(head[9:12])
+            length = 0
+            for line in head.split(b'\r\n'):
+                if line.lower().startswith(b'content-length:'):
+                    length = int(line.split(b':', 1)[1])
+            if length:
+                await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+            statuses[status] = statuses.get(status, 0) + 1
+    finally:
+        writer.close()
+
+async def run_load_test(host, port, paths, connections, duration, headers):
+    latencies = []
+    statuses = {}
+    deadline = time.perf_counter() + duration
+    start = time.perf_counter()
+    await asyncio.gather(*(client(host, port, paths, deadline, latencies, statuses, headers)
+                           for _ in range(connections)))
+    return time.perf_counter() - start, sorted(latencies), statuses
+
+def request_paths(url, mix):
+    """Build the request mix from the server's own section and question lists"""
+    with urlopen(f"{url}/sections") as response:
+        sections = list(json.load(response)['sections'])
+    with urlopen(f"{url}/sections/all") as response:
+        ids = [question['id'] for question in json.load(response)['questions']]
+    paths = {
+        'questions': [f"/questions/{question_id}" for question_id in ids],
+        'sections': [f"/sections/{section}" for section in sections],
+        'random': [f"/random?section={section}" for section in sections],
+        'exam': [f"/exam?n=80&seed={seed}" for seed in range(50)] + ["/exam?n=80"]
+    }
+    return [path for kind in mix for path in paths[kind]]
+
+def main():
+    """Hammer a running question_server.py and report throughput and latency"""
+    parser = argparse.ArgumentParser(description="Load-test the local question API server")
+    parser.add_argument('--url', default=DEFAULT_URL, help="server address (default: %(default)s)")
+    parser.add_argument('-c', '--connections', type=int, default=32, help="concurrent keep-alive connections (default: 32)")
+    parser.add_argument('-d', '--duration', type=float, default=10.0, help="seconds to run (default: 10)")
+    parser.add_argument('--mix', default='questions',
+                        help="comma-separated endpoint kinds: questions, sections, random, exam (default: %(default)s)")
+    parser.add_argument('--gzip', action='store_true', help="send Accept-Encoding: gzip")
+    parser.add_argument('--etag', action='store_true',
+                        help="send If-None-Match: * so cacheable responses are 304s")
+    args = parser.parse_args()
+
+    host, _, port = args.url.split('://', 1)[-1].partition(':')
+    paths = request_paths(args.url, [kind.strip() for kind in args.mix.split(',') if kind.strip()])
+    headers = ''
+    if args.gzip:
+        headers += "Accept-Encoding: gzip\r\n"
+    if args.etag:
+        headers += "If-None-Match: *\r\n"
+
+    elapsed, latencies, statuses = asyncio.run(
+        run_load_test(host, int(port or 80), paths, args.connections, args.duration, headers))
+    print(f"Requests: {len(latencies)} in {elapsed:.1f}s ({len(latencies) / elapsed:,.0f} req/s, "
+          f"{args.connections} connections)")
+    print(f"Status codes: {', '.join(f'{status}={count}' for status, count in sorted(statuses.items()))}")
+    print(f"Latency ms: p50 {percentile(latencies, 0.5) * 1000:.2f}, p90 {percentile(latencies, 0.9) * 1000:.2f}, "
+          f"p99 {percentile(latencies, 0.99) * 1000:.2f}, max {latencies[-1] * 1000 if latencies else 0:.2f}")
+
+if __name__ == "__main__":
+    main()
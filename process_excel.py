@@ -1,159 +1,578 @@
-import pandas as pd
-import openpyxl
-from openpyxl import load_workbook
+import argparse
 import json
+import logging
 import os
 
-def process_excel_files():
-    """Process Excel files and extract questions with answers"""
+from build_io import atomic_write, encode_json, file_sha256, write_json_output
+from build_log import (TRACE, VERBOSITY_LEVELS, configure_logging, current_config, log_event,
+                       trace_enabled)
+from build_profile import StageProfiler, profile_stage, timed_rows
+from question_extractor import (assign_question_ids, build_style_colours, iter_questions, iter_sheet_rows,
+                                load_read_only_workbook)
+
+def log_progress(event, row_number, detail):
+    """Trace hook logging what the extractor finds, one record per step.
+
+    Only installed when trace logging is enabled, so normal builds never pay
+    for formatting these messages.
+    """
+    if event == 'group':
+        log_event(TRACE, event, f"    Found question group: {detail}", row=row_number, group=detail)
+    elif event == 'question':
+        log_event(TRACE, event, f"    Found question: {detail[:100]}...", row=row_number, question=detail)
+    elif event == 'answer':
+        number, answer_text, colour = detail
+        log_event(TRACE, event, f"    Found answer {number}: {answer_text[:50]}...",
+                  row=row_number, number=number, answer=answer_text, fill=colour)
+    elif event == 'extracted':
+        log_event(TRACE, event,
+                  f"    Extracted question with {len(detail['answers'])} answers, correct answer: {detail['correctAnswerIndex']}",
+                  row=row_number, correctAnswerIndex=detail['correctAnswerIndex'])
+
+def extract_questions_from_file(file, profile=False, trace_memory=False):
+    """Extract questions from a single Excel file.
+
+    Rows are streamed from the workbook straight into the shared extraction
+    engine (question_extractor.iter_questions), so memory stays flat
+    regardless of sheet length.  The sheet is read with the direct XLSX
+    reader (xlsx_reader.XlsxReader); workbooks it does not support are
+    read again with openpyxl, which yields identical rows.  Questions
+    without exactly one highlighted answer are skipped and described in the
+    returned issues.
+
+    With profile set, the load, style index and extraction stages are timed
+    (and their peak memory traced when trace_memory is set).
+
+    Returns a (questions, issues, error, stage records) tuple so it can run
+    inside a worker process; error is None on success and a message string
+    otherwise.
+    """
+    from xlsx_reader import UnsupportedWorkbook
+
+    source_file = os.path.basename(file)
+    log_event(logging.INFO, 'file_start', f"Processing {source_file}...", file=source_file)
+    
+    profiler = StageProfiler(trace_memory) if profile else None
+    try:
+        try:
+            questions, issues = extract_with_reader(file, source_file, profiler)
+        except UnsupportedWorkbook as e:
+            log_event(logging.DEBUG, 'reader_fallback', f"  {source_file}: {e}, reading with openpyxl",
+                      file=source_file, reason=str(e))
+            profiler = StageProfiler(trace_memory) if profile else None
+            questions, issues = extract_with_openpyxl(file, source_file, profiler)
+    except Exception as e:
+        return [], [], f"{type(e).__name__}: {e}", profiler.records if profiler else []
+    
+    return questions, issues, None, profiler.records if profiler else []
+
+def extract_rows(rows, source_file, profiler):
+    """Run the extraction engine over (row number, B, E, E colour) rows"""
+    issues = []
+    if profiler:
+        rows = timed_rows(rows, profiler, source_file)
+    trace = log_progress if trace_enabled() else None
+    questions = list(iter_questions(rows, source_file, issues, trace=trace))
+    return questions, issues
+
+def extract_with_reader(file, source_file, profiler):
+    """Extract with the direct XLSX reader; raises UnsupportedWorkbook to request openpyxl"""
+    from xlsx_reader import XlsxReader
+
+    reader = None
+    try:
+        with profile_stage(profiler, 'load_workbook', source_file):
+            reader = XlsxReader(file)
+            reader.load_shared_strings()
+        with profile_stage(profiler, 'style_index', source_file):
+            reader.load_style_colours()
+        with profile_stage(profiler, 'extract', source_file):
+            return extract_rows(reader.iter_rows(), source_file, profiler)
+    finally:
+        if reader is not None:
+            reader.close()
+
+def extract_with_openpyxl(file, source_file, profiler):
+    """Extract through openpyxl's read-only workbook"""
+    wb = None
+    try:
+        with profile_stage(profiler, 'load_workbook', source_file):
+            wb = load_read_only_workbook(file)
+        with profile_stage(profiler, 'style_index', source_file):
+            style_colours = build_style_colours(wb)
+        with profile_stage(profiler, 'extract', source_file):
+            return extract_rows(iter_sheet_rows(wb.active, style_colours), source_file, profiler)
+    finally:
+        # Read-only workbooks keep the zip file open until closed
+        if wb is not None:
+            wb.close()
+
+EXCEL_DIR = 'public/xlsx'
+SHARD_DIR = 'public/questions'
+ENCODED_FILE = 'public/questions.dict.json'
+
+def log_size_report(reports):
+    """Log raw/minified/compressed sizes of the written artifacts as a table"""
+    columns = ["raw", "minified", "gzip", "brotli"]
+    log_event(logging.INFO, 'size_report', f"Output sizes (bytes):")
+    log_event(logging.INFO, 'size_report', f"  {'file':<40}" + "".join(f"{column:>12}" for column in columns))
+    for report in reports:
+        cells = "".join(f"{report[column]:>12,}" if column in report else f"{'-':>12}" for column in columns)
+        log_event(logging.INFO, 'output_size', f"  {report['file']:<40}{cells}",
+                  **{key: value for key, value in report.items() if key != 'sha256'})
+
+def write_shards(questions, shard_dir, production=False):
+    """Write one JSON bundle per section plus a manifest describing them.
+
+    The manifest (index.json) lists every shard with its question count, IDs
+    and a content hash, so a client can fetch only the section it needs and
+    cache each shard independently.  Returns the manifest and the size
+    reports of the written files.
+    """
+    from question_index import question_section, section_sort_key
+
+    sections = {}
+    for question in questions:
+        sections.setdefault(question_section(question), []).append(question)
+    
+    os.makedirs(shard_dir, exist_ok=True)
+    shards = []
+    reports = []
+    for section, section_questions in sorted(sections.items(), key=lambda item: section_sort_key(item[0])):
+        shard_file = f"section-{section}.json"
+        report = write_json_output(os.path.join(shard_dir, shard_file), section_questions, production)
+        reports.append(report)
+        shards.append({
+            "section": section,
+            "file": shard_file,
+            "count": len(section_questions),
+            "sha256": report["sha256"],
+            "ids": [question['id'] for question in section_questions]
+        })
+    
+    # Remove shards of sections that no longer exist
+    current_files = {shard['file'] for shard in shards}
+    for file in os.listdir(shard_dir):
+        base_file = file[:-3] if file.endswith(('.gz', '.br')) else file
+        if file.startswith('section-') and base_file.endswith('.json') and base_file not in current_files:
+            os.remove(os.path.join(shard_dir, file))
+    
+    manifest = {
+        "version": 1,
+        "totalQuestions": len(questions),
+        "shards": shards
+    }
+    # The manifest is fetched first by clients, so keep it compact
+    atomic_write(os.path.join(shard_dir, 'index.json'), encode_json(manifest, minify=True))
+    return manifest, reports
+
+CACHE_FILE = '.cache/questions_cache.json'
+# Bump when the extraction logic changes so stale cache entries are discarded
+CACHE_VERSION = 2
+
+def load_cache(cache_file):
+    """Load the per-workbook cache manifest, or return an empty one"""
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        if cache.get('version') == CACHE_VERSION:
+            return cache
+        log_event(logging.INFO, 'cache_reset', f"Cache {cache_file} has an old format, rebuilding")
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        log_event(logging.WARNING, 'cache_error', f"Ignoring unreadable cache {cache_file}: {e}")
+    return {'version': CACHE_VERSION, 'files': {}}
+
+def save_cache(cache, cache_file):
+    """Write the cache manifest via a temp file so a crash never leaves it half-written"""
+    os.makedirs(os.path.dirname(cache_file) or '.', exist_ok=True)
+    atomic_write(cache_file, json.dumps(cache, ensure_ascii=False).encode('utf-8'))
+
+def lookup_cache(cache, file):
+    """Return cached (questions, issues) for a workbook, or None if it must be re-parsed.
+
+    A matching size and mtime is trusted as-is; otherwise the content hash
+    decides, so touching a file without changing it does not force a re-parse.
+    """
+    entry = cache['files'].get(file)
+    if entry is None:
+        return None
+    stat = os.stat(file)
+    if entry['size'] == stat.st_size and entry['mtime'] == stat.st_mtime_ns:
+        return entry['questions'], entry['issues']
+    if entry['size'] == stat.st_size and entry['sha256'] == file_sha256(file):
+        entry['mtime'] = stat.st_mtime_ns
+        return entry['questions'], entry['issues']
+    return None
+
+def store_cache(cache, file, questions, issues):
+    """Record a freshly parsed workbook in the cache"""
+    stat = os.stat(file)
+    cache['files'][file] = {
+        'size': stat.st_size,
+        'mtime': stat.st_mtime_ns,
+        'sha256': file_sha256(file),
+        'questions': questions,
+        'issues': issues
+    }
+
+def extract_stale_files(stale_files, workers, profiler=None):
+    """Extract every stale workbook, in worker processes when workers > 1.
+
+    Returns {file: (questions, issues, error)}.  Stage records from the
+    workers are merged into profiler.
+    """
+    profile = profiler is not None
+    trace_memory = profile and profiler.trace_memory
+    results = {}
+    if workers == 1:
+        for file in stale_files:
+            results[file] = extract_questions_from_file(file, profile, trace_memory)
+    else:
+        # multiprocessing is slow to import and only needed here
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+        log_event(logging.INFO, 'workers', f"Using {workers} worker processes", workers=workers)
+        with ProcessPoolExecutor(max_workers=workers, initializer=configure_logging,
+                                 initargs=current_config()) as executor:
+            futures = {executor.submit(extract_questions_from_file, file, profile, trace_memory): file
+                       for file in stale_files}
+            for future in as_completed(futures):
+                file = futures[future]
+                try:
+                    results[file] = future.result()
+                except Exception as e:
+                    # The worker itself died (e.g. BrokenProcessPool)
+                    results[file] = ([], [], f"{type(e).__name__}: {e}", [])
+    
+    for file, (file_questions, file_issues, error, stages) in list(results.items()):
+        if profiler:
+            profiler.merge(stages)
+        results[file] = (file_questions, file_issues, error)
+    return results
+
+OUTPUT_FILE = 'public/questions.json'
+
+def list_workbooks(excel_dir=EXCEL_DIR):
+    """Return the paths of the workbooks in excel_dir in file name order.
+
+    ~$name.xlsx files are Excel's lock files for open workbooks, not
+    workbooks, and are skipped.
+    """
+    return [os.path.join(excel_dir, name) for name in sorted(os.listdir(excel_dir))
+            if name.endswith(('.xlsx', '.xls')) and not name.startswith('~$')]
+
+def write_outputs(questions, monolithic=True, shard_dir=None, production=False, encoded_file=None,
+                  index_file=None, store_file=None, search_file=None, versions_dir=None, profiler=None):
+    """Write every requested build artifact for a merged bank.
+
+    Returns the list of written outputs for the summary and the size
+    reports of the JSON artifacts.  Each file is replaced atomically.  The
+    modules behind the optional artifacts are imported only when requested.
+    """
+    outputs = []
+    size_reports = []
+    if monolithic:
+        with profile_stage(profiler, 'write_json'):
+            size_reports.append(write_json_output(OUTPUT_FILE, questions, production))
+        outputs.append(OUTPUT_FILE)
+    if shard_dir:
+        with profile_stage(profiler, 'write_shards'):
+            manifest, shard_reports = write_shards(questions, shard_dir, production)
+        size_reports.extend(shard_reports)
+        outputs.append(f"{shard_dir} ({len(manifest['shards'])} shards)")
+    if encoded_file:
+        from question_codec import encode_questions
+        with profile_stage(profiler, 'write_encoded'):
+            size_reports.append(write_json_output(encoded_file, encode_questions(questions), production))
+        outputs.append(encoded_file)
+    if index_file:
+        from question_index import build_index
+        with profile_stage(profiler, 'write_index'):
+            size_reports.append(write_json_output(index_file, build_index(questions), production))
+        outputs.append(index_file)
+    if store_file:
+        from question_store import write_store
+        with profile_stage(profiler, 'write_store'):
+            write_store(questions, store_file)
+        outputs.append(store_file)
+    if search_file:
+        from question_search import build_search_index
+        with profile_stage(profiler, 'write_search'):
+            size_reports.append(write_json_output(search_file, build_search_index(questions), production))
+        outputs.append(search_file)
+    if versions_dir:
+        from question_versions import publish_version
+        with profile_stage(profiler, 'write_versions'):
+            version = publish_version(questions, versions_dir, minify=production)
+        if version is None:
+            log_event(logging.INFO, 'version', "Bank unchanged, no new version", unchanged=True)
+        elif 'patchBytes' in version:
+            log_event(logging.INFO, 'version',
+                      f"Version {version['version']}: +{version['added']} -{version['removed']} "
+                      f"~{version['modified']} questions, patch {version['patchBytes']:,} bytes "
+                      f"instead of {version['bytes']:,}", **version)
+        else:
+            log_event(logging.INFO, 'version', f"Version {version['version']}: first snapshot", **version)
+        outputs.append(f"{versions_dir} (version history)")
+    return outputs, size_reports
+
+def process_excel_files(workers=1, cache_file=CACHE_FILE, monolithic=True, shard_dir=None,
+                        production=False, encoded_file=None, index_file=None, store_file=None,
+                        search_file=None, versions_dir=None, dedup=False, profiler=None):
+    """Process Excel files and extract questions with answers
+
+    With workers > 1 every workbook is parsed in its own worker process;
+    workers=0 uses one worker per CPU core.  Results are merged in file
+    name order regardless of which worker finishes first.
+
+    Unless cache_file is None, extracted questions are cached per workbook
+    and only new or changed workbooks are re-parsed.
+
+    The bank is written to public/questions.json when monolithic is set and
+    as per-section shards with an index.json manifest when shard_dir is given.
+    production writes minified JSON with pre-compressed .gz/.br siblings.
+    encoded_file additionally receives the dictionary-encoded bank
+    (see question_codec.py), index_file the ID/section lookup index
+    (see question_index.py), store_file the memory-mapped binary store
+    (see question_store.py) and search_file the full-text search index
+    (see question_search.py).  versions_dir keeps a snapshot of every
+    changed build with delta patches between versions (see
+    question_versions.py).
+
+    dedup reports clusters of near-identical questions and identical
+    questions marked with different correct answers (see question_dedup.py).
+
+    profiler, a build_profile.StageProfiler, receives timings of every
+    build stage and of every parsed workbook.
+    """
     questions = []
     
     # Look for Excel files in the public/xlsx directory
-    excel_dir = 'public/xlsx'
+    excel_dir = EXCEL_DIR
     if not os.path.exists(excel_dir):
-        print(f"Directory {excel_dir} not found. Creating it...")
+        log_event(logging.WARNING, 'no_input', f"Directory {excel_dir} not found. Creating it...")
         os.makedirs(excel_dir, exist_ok=True)
-        print(f"Created directory {excel_dir}")
-        print("Please place your Excel files in this directory and run the script again.")
+        log_event(logging.WARNING, 'no_input', f"Created directory {excel_dir}")
+        log_event(logging.WARNING, 'no_input', "Please place your Excel files in this directory and run the script again.")
         return questions
     
-    excel_files = []
-    for file in os.listdir(excel_dir):
-        if file.endswith(('.xlsx', '.xls')):
-            excel_files.append(os.path.join(excel_dir, file))
+    with profile_stage(profiler, 'scan'):
+        excel_files = list_workbooks(excel_dir)
     
     if not excel_files:
-        print(f"No Excel files found in {excel_dir}")
-        print("Please place your Excel files (.xlsx or .xls) in the public/xlsx directory.")
+        log_event(logging.WARNING, 'no_input', f"No Excel files found in {excel_dir}")
+        log_event(logging.WARNING, 'no_input', "Please place your Excel files (.xlsx or .xls) in the public/xlsx directory.")
         return questions
     
-    print(f"Found {len(excel_files)} Excel files: {[os.path.basename(f) for f in excel_files]}")
+    log_event(logging.INFO, 'found_files', f"Found {len(excel_files)} Excel files: {[os.path.basename(f) for f in excel_files]}",
+              files=[os.path.basename(f) for f in excel_files])
     
-    processed_files = 0
-    questions_per_file = {}
+    results = {}
+    stale_files = excel_files
+    cache = None
+    if cache_file:
+        with profile_stage(profiler, 'cache_lookup'):
+            cache = load_cache(cache_file)
+            # Evict entries for workbooks that no longer exist
+            for file in list(cache['files']):
+                if file not in excel_files:
+                    del cache['files'][file]
+            stale_files = []
+            for file in excel_files:
+                cached = lookup_cache(cache, file)
+                if cached is None:
+                    stale_files.append(file)
+                else:
+                    results[file] = (*cached, None)
+        log_event(logging.INFO, 'cache', f"Cache: {len(excel_files) - len(stale_files)} unchanged, {len(stale_files)} to process",
+                  unchanged=len(excel_files) - len(stale_files), stale=len(stale_files))
     
-    for file in excel_files:
-        print(f"Processing {os.path.basename(file)}...")
-        file_questions = 0
-        
-        try:
-            # Load workbook with formatting to access cell properties
-            wb = openpyxl.load_workbook(file, data_only=False)
-            ws = wb.active
-            
-            # Get all data with cell objects to access formatting
-            data = []
-            for row in ws.iter_rows():
-                data.append(row)
-            
-            print(f"  Loaded {len(data)} rows from {os.path.basename(file)}")
-            
-            # Skip first row (header) and start from row 2
-            step = "group_title"  # Initial step
-            current_group_title = None
-            current_question = None
-            current_answers = []
-            current_answer_cells = []  # Track cells to check background color
-            
-            # Loop through all rows starting from index 1 (second row)
-            for i in range(1, len(data)):
-                row = data[i]
-                
-                if step == "group_title":
-                    # Look for question group title in Column B (index 1)
-                    if row and len(row) > 1 and row[1] and isinstance(row[1].value, str) and row[1].value.strip():
-                        current_group_title = str(row[1].value).strip()
-                        print(f"    Found question group: {current_group_title}")
-                        
-                        # Check if this same row also has a question in Column E
-                        if row and len(row) > 4 and row[4] and isinstance(row[4].value, str) and row[4].value.strip():
-                            current_question = str(row[4].value).strip()
-                            print(f"    Found question in same row: {current_question[:100]}...")
-                            step = "answers"
-                            current_answers = []
-                            current_answer_cells = []
-                        else:
-                            step = "question"
-                
-                elif step == "question":
-                    # Look for question in Column E (index 4)
-                    if row and len(row) > 4 and row[4] and isinstance(row[4].value, str) and row[4].value.strip():
-                        current_question = str(row[4].value).strip()
-                        print(f"    Found question: {current_question[:100]}...")
-                        step = "answers"
-                        current_answers = []
-                        current_answer_cells = []
-                
-                elif step == "answers":
-                    # Look for answers in Column E (index 4)
-                    if row and len(row) > 4 and row[4] and isinstance(row[4].value, str) and row[4].value.strip():
-                        answer_text = str(row[4].value).strip()
-                        current_answers.append(answer_text)
-                        current_answer_cells.append(row[4])  # Store cell for background check
-                        print(f"    Found answer {len(current_answers)}: {answer_text[:50]}...")
-                        
-                        # If we found 4 answers, save the question and reset
-                        if len(current_answers) >= 4:
-                            # Determine correct answer by checking background color
-                            correct_answer_index = 0  # Default to first answer
-                            for j, cell in enumerate(current_answer_cells):
-                                try:
-                                    if (cell.fill and cell.fill.bgColor and 
-                                        hasattr(cell.fill.bgColor, 'indexed') and 
-                                        cell.fill.bgColor.indexed == 64):
-                                        correct_answer_index = j
-                                        break
-                                except:
-                                    # If there's an error checking background color, continue
-                                    continue
-                            
-                            question_obj = {
-                                "question": current_question,
-                                "answers": current_answers,
-                                "correctAnswerIndex": correct_answer_index,
-                                "questionGroup": current_group_title,
-                                "sourceFile": os.path.basename(file)
-                            }
-                            
-                            questions.append(question_obj)
-                            file_questions += 1
-                            
-                            print(f"    Extracted question with {len(current_answers)} answers, correct answer: {correct_answer_index}")
-                            
-                            # Reset for next question
-                            step = "group_title"
-                            current_question = None
-                            current_answers = []
-                            current_answer_cells = []
-            
-            questions_per_file[os.path.basename(file)] = file_questions
+    if workers == 0:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(stale_files)))
+    
+    with profile_stage(profiler, 'extract_all'):
+        results.update(extract_stale_files(stale_files, workers, profiler))
+    
+    if cache is not None:
+        with profile_stage(profiler, 'cache_save'):
+            for file in stale_files:
+                file_questions, file_issues, error = results[file]
+                if error:
+                    # Never cache a failed parse
+                    cache['files'].pop(file, None)
+                else:
+                    store_cache(cache, file, file_questions, file_issues)
+            try:
+                save_cache(cache, cache_file)
+            except Exception as e:
+                log_event(logging.WARNING, 'cache_error', f"Error saving cache {cache_file}: {e}")
+    
+    # Merge in deterministic (file name) order
+    with profile_stage(profiler, 'merge'):
+        processed_files = 0
+        questions_per_file = {}
+        errors = {}
+        answer_issues = []
+        for file in excel_files:
+            file_questions, file_issues, error = results[file]
+            if error:
+                errors[os.path.basename(file)] = error
+                continue
+            questions.extend(file_questions)
+            answer_issues.extend(file_issues)
+            questions_per_file[os.path.basename(file)] = len(file_questions)
             processed_files += 1
-            
-        except Exception as e:
-            print(f"Error processing {file}: {e}")
+        
+        id_collisions = assign_question_ids(questions)
+    
+    duplicate_clusters = []
+    answer_conflicts = []
+    if dedup:
+        from question_dedup import describe, find_answer_conflicts, find_near_duplicates
+        with profile_stage(profiler, 'dedup'):
+            duplicate_clusters = find_near_duplicates(questions)
+            answer_conflicts = find_answer_conflicts(questions)
     
-    # Save to JSON file
-    output_file = 'public/questions.json'
+    # Save the bank and any extra artifacts
     try:
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(questions, f, ensure_ascii=False, indent=2)
+        outputs, size_reports = write_outputs(questions, monolithic, shard_dir, production, encoded_file,
+                                              index_file, store_file, search_file, versions_dir, profiler)
         
-        print(f"\nProcessing complete!")
-        print(f"Total questions extracted: {len(questions)}")
-        print(f"Files processed: {processed_files}")
-        print(f"Questions per file:")
+        log_event(logging.INFO, 'summary', f"\nProcessing complete!",
+                  questions=len(questions), files=processed_files)
+        log_event(logging.INFO, 'summary', f"Total questions extracted: {len(questions)}")
+        log_event(logging.INFO, 'summary', f"Files processed: {processed_files}")
+        log_event(logging.INFO, 'summary', f"Questions per file:")
         for file, count in questions_per_file.items():
-            print(f"  {file}: {count} questions")
-        print(f"Output saved to: {output_file}")
+            log_event(logging.INFO, 'file_questions', f"  {file}: {count} questions", file=file, questions=count)
+        if answer_issues:
+            log_event(logging.WARNING, 'answer_issues', f"Questions without a single highlighted answer: {len(answer_issues)}")
+            for issue in answer_issues:
+                log_event(logging.WARNING, 'answer_issue', f"  {issue}")
+        if id_collisions:
+            log_event(logging.WARNING, 'id_collisions', f"Question ID collisions: {len(id_collisions)}")
+            for collision in id_collisions:
+                log_event(logging.WARNING, 'id_collision', f"  {collision}")
+        if duplicate_clusters:
+            log_event(logging.INFO, 'duplicate_clusters',
+                      f"Near-duplicate clusters: {len(duplicate_clusters)}")
+            for cluster in duplicate_clusters:
+                log_event(logging.INFO, 'duplicate_cluster', f"  Cluster of {len(cluster)}:",
+                          ids=[questions[position]['id'] for position, _ in cluster])
+                for position, similarity in cluster:
+                    log_event(logging.INFO, 'duplicate_cluster', f"    {similarity:.2f}  {describe(questions[position])}")
+        if answer_conflicts:
+            log_event(logging.WARNING, 'answer_conflicts',
+                      f"Identical questions with conflicting answers: {len(answer_conflicts)}")
+            for conflict in answer_conflicts:
+                log_event(logging.WARNING, 'answer_conflict',
+                          f"  {', '.join(describe(questions[position]) for position in conflict)}",
+                          ids=[questions[position]['id'] for position in conflict])
+        if errors:
+            log_event(logging.ERROR, 'file_errors', f"Files with errors: {len(errors)}")
+            for file, error in errors.items():
+                log_event(logging.ERROR, 'file_error', f"  {file}: {error}", file=file, error=error)
+        if production or encoded_file:
+            log_size_report(size_reports)
+        log_event(logging.INFO, 'output', f"Output saved to: {', '.join(outputs)}", outputs=outputs)
         
     except Exception as e:
-        print(f"Error saving to {output_file}: {e}")
+        log_event(logging.ERROR, 'output_error', f"Error saving output: {e}")
     
     return questions
 
-def main():
+def main(argv=None, prog=None):
     """Main function to process Excel files"""
-    questions = process_excel_files()
+    from question_index import INDEX_FILE
+    from question_search import SEARCH_FILE
+    from question_store import STORE_FILE
+    from question_versions import VERSIONS_DIR
+    
+    parser = argparse.ArgumentParser(prog=prog,
+                                     description="Extract questions from public/xlsx into public/questions.json")
+    parser.add_argument('-j', '--workers', type=int, default=1,
+                        help="number of worker processes (0 = one per CPU core, default: 1)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help=f"re-parse every workbook and skip the {CACHE_FILE} cache")
+    parser.add_argument('--shards', nargs='?', const=SHARD_DIR, metavar='DIR',
+                        help=f"also write per-section shards and an index.json manifest (default dir: {SHARD_DIR})")
+    parser.add_argument('--no-monolithic', action='store_true',
+                        help="do not write public/questions.json (use with --shards)")
+    parser.add_argument('--production', action='store_true',
+                        help="write minified JSON plus .gz/.br siblings and print a size report")
+    parser.add_argument('--encoded', nargs='?', const=ENCODED_FILE, metavar='PATH',
+                        help=f"also write the dictionary-encoded bank (default: {ENCODED_FILE})")
+    parser.add_argument('--index', nargs='?', const=INDEX_FILE, metavar='PATH',
+                        help=f"also write the ID/section lookup index (default: {INDEX_FILE})")
+    parser.add_argument('--store', nargs='?', const=STORE_FILE, metavar='PATH',
+                        help=f"also write the memory-mapped binary store (default: {STORE_FILE})")
+    parser.add_argument('--search', nargs='?', const=SEARCH_FILE, metavar='PATH',
+                        help=f"also write the full-text search index (default: {SEARCH_FILE})")
+    parser.add_argument('--versions', nargs='?', const=VERSIONS_DIR, metavar='DIR',
+                        help=f"keep versioned snapshots and delta patches between builds (default dir: {VERSIONS_DIR})")
+    parser.add_argument('--dedup', action='store_true',
+                        help="report near-duplicate questions and conflicting answer keys")
+    parser.add_argument('--watch', action='store_true',
+                        help="keep running and republish the outputs whenever a workbook changes")
+    parser.add_argument('--debounce', type=float, default=1.0,
+                        help="with --watch, seconds of quiet before rebuilding (default: 1.0)")
+    parser.add_argument('--log-level', choices=sorted(VERBOSITY_LEVELS), default='summary',
+                        help="quiet: problems only, summary: per-file progress and totals (default), "
+                             "trace: every group/question/answer found")
+    parser.add_argument('--log-json', metavar='PATH',
+                        help="also append log records to PATH as JSON lines")
+    parser.add_argument('--profile', action='store_true',
+                        help="print wall time, CPU time and peak memory (tracemalloc) per stage and workbook")
+    parser.add_argument('--profile-json', metavar='PATH',
+                        help="also write the profile as JSON to PATH (implies --profile)")
+    args = parser.parse_args(argv)
+    
+    if args.watch:
+        unsupported = [option for option, given in (('--dedup', args.dedup), ('-j', args.workers != 1),
+                                                    ('--profile', args.profile or args.profile_json)) if given]
+        if unsupported:
+            parser.error(f"--watch cannot be combined with {', '.join(unsupported)}")
+    
+    configure_logging(args.log_level, args.log_json)
+    if args.watch:
+        # Imported here because watch_excel builds on this module
+        from watch_excel import watch_workbooks
+        watch_workbooks(cache_file=None if args.no_cache else CACHE_FILE,
+                        debounce=args.debounce,
+                        monolithic=not args.no_monolithic,
+                        shard_dir=args.shards,
+                        production=args.production,
+                        encoded_file=args.encoded,
+                        index_file=args.index,
+                        store_file=args.store,
+                        search_file=args.search,
+                        versions_dir=args.versions)
+        return []
+    
+    profiler = StageProfiler(trace_memory=True) if args.profile or args.profile_json else None
+    questions = process_excel_files(workers=args.workers,
+                                    cache_file=None if args.no_cache else CACHE_FILE,
+                                    monolithic=not args.no_monolithic,
+                                    shard_dir=args.shards,
+                                    production=args.production,
+                                    encoded_file=args.encoded,
+                                    index_file=args.index,
+                                    store_file=args.store,
+                                    search_file=args.search,
+                                    versions_dir=args.versions,
+                                    dedup=args.dedup,
+                                    profiler=profiler)
+    
+    if profiler:
+        # Logged at WARNING so an explicitly requested profile also shows with --log-level quiet
+        log_event(logging.WARNING, 'profile', "\nBuild profile:")
+        for line in profiler.format_table():
+            log_event(logging.WARNING, 'profile', line)
+        if args.profile_json:
+            profiler.write_json(args.profile_json)
+            log_event(logging.INFO, 'profile', f"Profile saved to: {args.profile_json}")
     return questions
 
 if __name__ == "__main__":
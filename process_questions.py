@@ -1,60 +1,223 @@
+import argparse
+import fnmatch
 import json
 import os
+from collections import Counter
 
-def process_questions():
-    """Process and print the first 20 rows of questions.json"""
-    
-    # Path to the questions.json file
-    questions_file = "public/questions.json"
-    
-    # Check if file exists
-    if not os.path.exists(questions_file):
-        print(f"Error: {questions_file} not found!")
+from question_index import question_section, section_sort_key
+
+QUESTIONS_FILE = "public/questions.json"
+CHUNK_SIZE = 64 * 1024
+
+def iter_json_array(path, chunk_size=CHUNK_SIZE):
+    """Yield the elements of a top-level JSON array one at a time.
+
+    The file is read in chunks and each element is decoded as soon as it is
+    complete, so memory stays bounded by the chunk size plus one element and
+    a consumer that stops early never reads the rest of the file.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, 'r', encoding='utf-8') as f:
+        buffer = ''
+        position = 0
+        eof = False
+        expect = '['
+
+        def fill():
+            nonlocal buffer, position, eof
+            chunk = f.read(chunk_size)
+            if not chunk:
+                eof = True
+            buffer = buffer[position:] + chunk
+            position = 0
+
+        while True:
+            # Skip whitespace up to the next structural character
+            while True:
+                while position < len(buffer) and buffer[position].isspace():
+                    position += 1
+                if position < len(buffer) or eof:
+                    break
+                fill()
+            if position >= len(buffer):
+                raise json.JSONDecodeError("Unexpected end of file", buffer, position)
+
+            char = buffer[position]
+            if expect == '[':
+                if char != '[':
+                    raise json.JSONDecodeError("Expected a JSON array", buffer, position)
+                position += 1
+                expect = 'first'
+            elif char == ']' and expect in ('first', ','):
+                return
+            elif expect == ',':
+                if char != ',':
+                    raise json.JSONDecodeError("Expected ',' or ']'", buffer, position)
+                position += 1
+                expect = 'value'
+            else:
+                # An incomplete element fails to decode; read more and retry
+                while True:
+                    try:
+                        value, end = decoder.raw_decode(buffer, position)
+                    except json.JSONDecodeError:
+                        if eof:
+                            raise
+                        fill()
+                        continue
+                    if end == len(buffer) and not eof:
+                        # A number may continue in the next chunk
+                        fill()
+                        continue
+                    break
+                position = end
+                expect = ','
+                yield value
+
+def matches(question, position, args):
+    """Return True if the question at a bank position passes every filter given on the command line"""
+    if args.source and not any(fnmatch.fnmatch(question.get('sourceFile', ''), pattern)
+                               for pattern in args.source):
+        return False
+    if args.section and question_section(question) not in args.section:
+        return False
+    if args.group and args.group.lower() not in (question.get('questionGroup') or '').lower():
+        return False
+    if args.id and question.get('id') not in args.id:
+        return False
+    if args.start is not None and position < args.start:
+        return False
+    if args.end is not None and position > args.end:
+        return False
+    if args.correct is not None and question.get('correctAnswerIndex') != args.correct:
+        return False
+    return True
+
+def print_question(number, question):
+    """Print one question in the inspector's row format"""
+    print(f"\n--- Row {number} ---")
+    print(f"ID: {question.get('id', 'N/A')}")
+    print(f"Question Group: {question.get('questionGroup', 'N/A')}")
+    print(f"Question: {question.get('question', 'N/A')}")
+    print(f"Answers:")
+    for j, answer in enumerate(question.get('answers', [])):
+        marker = "✓" if j == question.get('correctAnswerIndex', -1) else " "
+        print(f"  {marker} {j + 1}. {answer}")
+    print(f"Correct Answer Index: {question.get('correctAnswerIndex', 'N/A')}")
+    print(f"Source File: {question.get('sourceFile', 'N/A')}")
+    print("-" * 60)
+
+class BankStats:
+    """Aggregate statistics gathered in one pass; memory grows with the number
+    of distinct files and groups, not with the number of questions"""
+
+    def __init__(self):
+        self.scanned = 0
+        self.matched = 0
+        self.sections = Counter()
+        self.files = Counter()
+        self.groups = Counter()
+        self.correct_indexes = Counter()
+        self.answer_counts = Counter()
+        self.question_chars = 0
+
+    def add(self, question):
+        self.matched += 1
+        self.sections[question_section(question)] += 1
+        self.files[question.get('sourceFile', 'Unknown')] += 1
+        self.groups[question.get('questionGroup') or 'Unknown'] += 1
+        self.correct_indexes[question.get('correctAnswerIndex')] += 1
+        self.answer_counts[len(question.get('answers', []))] += 1
+        self.question_chars += len(question.get('question', ''))
+
+    def print_report(self, top_groups=10):
+        print(f"\n=== STATISTICS ===")
+        print(f"Questions scanned: {self.scanned}")
+        print(f"Questions matching filters: {self.matched}")
+        if not self.matched:
+            return
+        print(f"Average question length: {self.question_chars / self.matched:.0f} characters")
+        print("Questions per section:")
+        for section in sorted(self.sections, key=section_sort_key):
+            print(f"  {section}: {self.sections[section]}")
+        print("Questions per file:")
+        for file in sorted(self.files):
+            print(f"  {file}: {self.files[file]}")
+        print("Correct answer position:")
+        for index in sorted(self.correct_indexes, key=str):
+            share = self.correct_indexes[index] / self.matched * 100
+            print(f"  {index}: {self.correct_indexes[index]} ({share:.1f}%)")
+        print("Answers per question:")
+        for count in sorted(self.answer_counts):
+            print(f"  {count}: {self.answer_counts[count]}")
+        print(f"Unique question groups: {len(self.groups)}")
+        for group, count in self.groups.most_common(top_groups):
+            print(f"  {count:>4}  {group}")
+
+def process_questions(args):
+    """Stream questions.json, print the questions that match the filters and optionally summarize the bank"""
+    if not os.path.exists(args.file):
+        print(f"Error: {args.file} not found!")
         return
-    
+
+    stats = BankStats() if args.stats else None
+    printed = 0
+    groups = set()
+
     try:
-        # Read the JSON file
-        with open(questions_file, 'r', encoding='utf-8') as f:
-            questions = json.load(f)
-        
-        print(f"Total questions in file: {len(questions)}")
-        print("=" * 80)
-        
-        # Process first 20 rows (or all if less than 20)
-        rows_to_process = min(20, len(questions))
-        
-        for i in range(rows_to_process):
-            question = questions[i]
-            
-            print(f"\n--- Row {i + 1} ---")
-            print(f"Question Group: {question.get('questionGroup', 'N/A')}")
-            print(f"Question: {question.get('question', 'N/A')}")
-            print(f"Answers:")
-            for j, answer in enumerate(question.get('answers', [])):
-                marker = "✓" if j == question.get('correctAnswerIndex', -1) else " "
-                print(f"  {marker} {j + 1}. {answer}")
-            print(f"Correct Answer Index: {question.get('correctAnswerIndex', 'N/A')}")
-            print(f"Source File: {question.get('sourceFile', 'N/A')}")
-            print("-" * 60)
-        
-        # Summary statistics
-        print(f"\n=== SUMMARY ===")
-        print(f"Processed {rows_to_process} rows")
-        
-        # Count unique question groups
-        question_groups = set()
-        for i in range(rows_to_process):
-            question_groups.add(questions[i].get('questionGroup', 'Unknown'))
-        
-        print(f"Unique question groups in first {rows_to_process} rows: {len(question_groups)}")
-        print("Question groups found:")
-        for group in sorted(question_groups):
-            print(f"  - {group}")
-            
+        for position, question in enumerate(iter_json_array(args.file)):
+            if args.end is not None and position > args.end and not stats:
+                # Past the requested positions: stop reading the file
+                break
+            if stats:
+                stats.scanned += 1
+            if not matches(question, position, args):
+                continue
+            if stats:
+                stats.add(question)
+            if printed < args.limit:
+                printed += 1
+                groups.add(question.get('questionGroup', 'Unknown'))
+                print_question(printed, question)
+            if printed >= args.limit and not stats:
+                # Nothing left to print or count: stop reading the file
+                break
     except json.JSONDecodeError as e:
         print(f"Error parsing JSON: {e}")
+        return
     except Exception as e:
         print(f"Error: {e}")
+        return
+
+    print(f"\n=== SUMMARY ===")
+    print(f"Printed {printed} rows")
+    print(f"Unique question groups in printed rows: {len(groups)}")
+    for group in sorted(groups, key=str):
+        print(f"  - {group}")
+
+    if stats:
+        stats.print_report()
+
+def main(argv=None, prog=None):
+    """Parse command-line filters and run the inspector"""
+    parser = argparse.ArgumentParser(prog=prog, description="Stream and filter questions.json")
+    parser.add_argument('file', nargs='?', default=QUESTIONS_FILE, help="questions file (default: %(default)s)")
+    parser.add_argument('--source', action='append', metavar='PATTERN',
+                        help="only questions from matching source files, e.g. '2.*.xlsx' (repeatable)")
+    parser.add_argument('--section', action='append', help="only questions from this section (repeatable)")
+    parser.add_argument('--group', help="only questions whose group contains this text (case-insensitive)")
+    parser.add_argument('--id', action='append', help="only the question with this ID (repeatable)")
+    parser.add_argument('--from', dest='start', type=int, metavar='N',
+                        help="only questions at bank position N or later (0-based)")
+    parser.add_argument('--to', dest='end', type=int, metavar='N',
+                        help="only questions at bank position N or earlier; reading stops there unless --stats")
+    parser.add_argument('--correct', type=int, metavar='INDEX', help="only questions with this correctAnswerIndex (0-based)")
+    parser.add_argument('--limit', type=int, default=20,
+                        help="print at most this many questions; reading stops there unless --stats (default: 20)")
+    parser.add_argument('--stats', action='store_true',
+                        help="also compute statistics over every matching question in the bank")
+    args = parser.parse_args(argv)
+    process_questions(args)
 
 if __name__ == "__main__":
-    process_questions() 
\ No newline at end of file
+    main()
@@ -0,0 +1,151 @@
+import json
+import os
+from collections import Counter, defaultdict
+
+from build_io import encode_json
+
+FORMAT_NAME = 'bankquiz-dict'
+FORMAT_VERSION = 1
+
+# Shorter shared prefixes are not worth a lookup-table entry
+MIN_PREFIX_LENGTH = 12
+
+def word_prefixes(text):
+    """Return the prefixes of text that end just after a space"""
+    prefixes = []
+    position = text.find(' ', MIN_PREFIX_LENGTH - 1)
+    while position != -1:
+        prefixes.append(text[:position + 1])
+        position = text.find(' ', position + 1)
+    return prefixes
+
+def choose_prefixes(texts):
+    """Pick shared question prefixes and return (prefix table, prefix index per text).
+
+    Every text is assigned the longest word-boundary prefix it shares with at
+    least one other text that has not already claimed a longer one; texts
+    without such a prefix get -1.  Each candidate is visited once, so this is
+    linear in the total number of words.
+    """
+    members = defaultdict(list)
+    for i, text in enumerate(texts):
+        for prefix in word_prefixes(text):
+            members[prefix].append(i)
+    
+    assigned = [None] * len(texts)
+    for prefix in sorted(members, key=lambda p: (-len(p), p)):
+        unassigned = [i for i in members[prefix] if assigned[i] is None]
+        if len(unassigned) >= 2:
+            for i in unassigned:
+                assigned[i] = prefix
+    
+    # Most used prefixes get the smallest indexes
+    usage = Counter(prefix for prefix in assigned if prefix is not None)
+    table = [prefix for prefix, _ in sorted(usage.items(), key=lambda item: (-item[1], item[0]))]
+    index = {prefix: i for i, prefix in enumerate(table)}
+    return table, [index[prefix] if prefix is not None else -1 for prefix in assigned]
+
+def build_table(values):
+    """Return (table, index) for values, ordered by first appearance"""
+    index = {}
+    for value in values:
+        if value not in index:
+            index[value] = len(index)
+    return list(index), index
+
+def encode_questions(questions):
+    """Dictionary-encode a question list.
+
+    Group titles, source file names and common question prefixes are moved
+    into lookup tables and each question becomes a row of
+    [id, group, sourceFile, prefix, question remainder, answers,
+    correctAnswerIndex] referencing them by index.
+    """
+    groups, group_index = build_table(q['questionGroup'] for q in questions)
+    source_files, source_file_index = build_table(q['sourceFile'] for q in questions)
+    prefixes, prefix_ids = choose_prefixes([q['question'] for q in questions])
+    
+    rows = []
+    for question, prefix_id in zip(questions, prefix_ids):
+        text = question['question']
+        if prefix_id != -1:
+            text = text[len(prefixes[prefix_id]):]
+        rows.append([
+            question['id'],
+            group_index[question['questionGroup']],
+            source_file_index[question['sourceFile']],
+            prefix_id,
+            text,
+            question['answers'],
+            question['correctAnswerIndex']
+        ])
+    
+    return {
+        "format": FORMAT_NAME,
+        "version": FORMAT_VERSION,
+        "groups": groups,
+        "sourceFiles": source_files,
+        "prefixes": prefixes,
+        "questions": rows
+    }
+
+def decode_questions(encoded):
+    """Expand a dictionary-encoded bank back to the questions.json schema"""
+    if encoded.get('format') != FORMAT_NAME or encoded.get('version') != FORMAT_VERSION:
+        raise ValueError(f"Unsupported encoding: {encoded.get('format')} v{encoded.get('version')}")
+    
+    groups = encoded['groups']
+    source_files = encoded['sourceFiles']
+    prefixes = encoded['prefixes']
+    questions = []
+    for qid, group, source_file, prefix_id, text, answers, correct_answer_index in encoded['questions']:
+        questions.append({
+            "question": prefixes[prefix_id] + text if prefix_id != -1 else text,
+            "answers": answers,
+            "correctAnswerIndex": correct_answer_index,
+            "questionGroup": groups[group],
+            "sourceFile": source_files[source_file],
+            "id": qid
+        })
+    return questions
+
+def compare_sizes(questions):
+    """Return byte sizes of the plain and dictionary-encoded forms of a bank"""
+    import gzip
+    
+    encoded = encode_questions(questions)
+    plain = encode_json(questions, minify=True)
+    compact = encode_json(encoded, minify=True)
+    return {
+        "plain (indented)": len(encode_json(questions)),
+        "plain (minified)": len(plain),
+        "encoded (minified)": len(compact),
+        "plain (minified, gzip)": len(gzip.compress(plain, compresslevel=9)),
+        "encoded (minified, gzip)": len(gzip.compress(compact, compresslevel=9))
+    }
+
+def main():
+    """Measure the dictionary encoding against questions.json and verify it round-trips"""
+    questions_file = 'public/questions.json'
+    
+    if not os.path.exists(questions_file):
+        print(f"File {questions_file} not found!")
+        return
+    
+    with open(questions_file, 'r', encoding='utf-8') as f:
+        questions = json.load(f)
+    
+    encoded = encode_questions(questions)
+    round_trip = decode_questions(json.loads(json.dumps(encoded, ensure_ascii=False)))
+    print(f"Loaded {len(questions)} questions")
+    print(f"Lookup tables: {len(encoded['groups'])} groups, {len(encoded['sourceFiles'])} source files, "
+          f"{len(encoded['prefixes'])} question prefixes")
+    print(f"Round trip: {'OK' if round_trip == questions else 'MISMATCH'}")
+    
+    sizes = compare_sizes(questions)
+    baseline = sizes["plain (indented)"]
+    for name, size in sizes.items():
+        print(f"  {name:<26}{size:>10,} bytes  ({size / baseline:.1%} of current output)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+import argparse
+import json
+import re
+import zlib
+
+SHINGLE_SIZE = 4
+NUM_HASHES = 64
+BANDS = 16
+ROWS_PER_BAND = NUM_HASHES // BANDS
+DEFAULT_THRESHOLD = 0.8
+# Candidates whose signatures agree on fewer than threshold - margin of the
+# hashes are dropped before the exact Jaccard check (about 3 standard errors)
+ESTIMATE_MARGIN = 0.15
+# 64-bit multiplicative mixing of the 32-bit shingle hashes; NUM_HASHES must be a power of two
+MIX_MULTIPLIER = 0x9E3779B97F4A7C15
+HASH_MASK = (1 << 64) - 1
+BIN_SHIFT = 64 - (NUM_HASHES.bit_length() - 1)
+VALUE_MASK = (1 << BIN_SHIFT) - 1
+
+def normalize_text(text):
+    """Casefold and reduce a string to words separated by single spaces"""
+    return ' '.join(re.findall(r'\w+', (text or '').casefold()))
+
+def question_text(question):
+    """Text compared for near-duplicates: the question and its answers in sorted order"""
+    answers = sorted(normalize_text(answer) for answer in question['answers'])
+    return ' | '.join([normalize_text(question['question'])] + answers)
+
+def shingles(text, size=SHINGLE_SIZE):
+    """Return the set of hashed character shingles of a text"""
+    if len(text) <= size:
+        return {zlib.crc32(text.encode('utf-8'))}
+    return {zlib.crc32(text[i:i + size].encode('utf-8')) for i in range(len(text) - size + 1)}
+
+def minhash(shingle_set):
+    """Return the one-permutation MinHash signature of a set of shingle hashes.
+
+    Each shingle is hashed once: the top bits pick one of NUM_HASHES bins
+    and the rest is its value, and each bin keeps its minimum.  Empty bins
+    borrow from the next non-empty bin (rotation densification), so the cost
+    per question is linear in its shingles instead of shingles x hashes.
+    """
+    signature = [None] * NUM_HASHES
+    for shingle in shingle_set:
+        mixed = (shingle * MIX_MULTIPLIER) & HASH_MASK
+        position = mixed >> BIN_SHIFT
+        value = mixed & VALUE_MASK
+        current = signature[position]
+        if current is None or value < current:
+            signature[position] = value
+    for position in range(NUM_HASHES):
+        if signature[position] is None:
+            for offset in range(1, NUM_HASHES):
+                borrowed = signature[(position + offset) % NUM_HASHES]
+                if borrowed is not None:
+                    signature[position] = borrowed + offset * (VALUE_MASK + 1)
+                    break
+    return signature
+
+def jaccard(first, second):
+    """Jaccard similarity of two sets"""
+    if not first and not second:
+        return 1.0
+    return len(first & second) / len(first | second)
+
+class DisjointSet:
+    """Union-find over positions, used to grow pairs into clusters"""
+
+    def __init__(self, size):
+        self.parent = list(range(size))
+
+    def find(self, item):
+        while self.parent[item] != item:
+            self.parent[item] = self.parent[self.parent[item]]
+            item = self.parent[item]
+        return item
+
+    def union(self, first, second):
+        first, second = self.find(first), self.find(second)
+        if first != second:
+            self.parent[max(first, second)] = min(first, second)
+
+def find_near_duplicates(questions, threshold=DEFAULT_THRESHOLD):
+    """Group questions whose text and answers are near-identical.
+
+    Every question gets a MinHash signature of its character shingles; the
+    signature is split into bands and questions sharing a band bucket become
+    candidates (locality-sensitive hashing), so work grows with the number of
+    questions rather than the number of pairs.  Candidates whose signatures
+    clearly disagree are dropped; the rest are confirmed by exact Jaccard
+    similarity >= threshold.  Returns clusters as lists of
+    (position, similarity-to-first) sorted by position, largest first.
+    """
+    shingle_sets = [shingles(question_text(question)) for question in questions]
+
+    signatures = [minhash(shingle_set) for shingle_set in shingle_sets]
+    min_agreement = (threshold - ESTIMATE_MARGIN) * NUM_HASHES
+
+    buckets = {}
+    for position, signature in enumerate(signatures):
+        for band in range(BANDS):
+            key = (band, *signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND])
+            buckets.setdefault(key, []).append(position)
+
+    # Comparing each bucket member with the bucket's first member and its
+    # predecessor keeps verification linear in bucket size; clusters are
+    # still joined transitively through the other bands.
+    clusters = DisjointSet(len(questions))
+    checked = set()
+    for members in buckets.values():
+        for i in range(1, len(members)):
+            for first in {members[0], members[i - 1]}:
+                second = members[i]
+                if (first, second) in checked or clusters.find(first) == clusters.find(second):
+                    continue
+                checked.add((first, second))
+                agreement = sum(a == b for a, b in zip(signatures[first], signatures[second]))
+                if agreement >= min_agreement and jaccard(shingle_sets[first], shingle_sets[second]) >= threshold:
+                    clusters.union(first, second)
+
+    groups = {}
+    for position in range(len(questions)):
+        groups.setdefault(clusters.find(position), []).append(position)
+    result = []
+    for members in groups.values():
+        if len(members) < 2:
+            continue
+        head = shingle_sets[members[0]]
+        result.append([(position, jaccard(head, shingle_sets[position])) for position in members])
+    result.sort(key=lambda members: (-len(members), members[0][0]))
+    return result
+
+def find_answer_conflicts(questions):
+    """Find identical questions (same text and answer set) marked with different correct answers.
+
+    The correct answer is compared by text, so the same question with its
+    answers in another order is not reported.  Returns lists of positions.
+    """
+    groups = {}
+    for position, question in enumerate(questions):
+        key = (normalize_text(question['question']),
+               tuple(sorted(normalize_text(answer) for answer in question['answers'])))
+        groups.setdefault(key, []).append(position)
+
+    conflicts = []
+    for members in groups.values():
+        correct = {normalize_text(questions[position]['answers'][questions[position]['correctAnswerIndex']])
+                   for position in members}
+        if len(members) > 1 and len(correct) > 1:
+            conflicts.append(members)
+    return conflicts
+
+def describe(question):
+    """One-line reference to a question for reports"""
+    return f"{question.get('id', '?')} ({question['sourceFile']}): {question['question'][:70]}"
+
+def duplicate_report(questions, threshold=DEFAULT_THRESHOLD):
+    """Return near-duplicate clusters and answer conflicts as JSON-serializable data"""
+    def entry(position, similarity=None):
+        question = questions[position]
+        item = {"id": question.get('id'), "sourceFile": question['sourceFile'],
+                "correctAnswer": question['answers'][question['correctAnswerIndex']]}
+        if similarity is not None:
+            item["similarity"] = round(similarity, 3)
+        return item
+
+    return {
+        "threshold": threshold,
+        "clusters": [[entry(position, similarity) for position, similarity in cluster]
+                     for cluster in find_near_duplicates(questions, threshold)],
+        "conflicts": [[entry(position) for position in conflict]
+                      for conflict in find_answer_conflicts(questions)]
+    }
+
+def main():
+    """Report near-duplicate questions and conflicting answer keys in questions.json"""
+    parser = argparse.ArgumentParser(description="Find near-duplicate questions and conflicting answers")
+    parser.add_argument('file', nargs='?', default='public/questions.json', help="questions file (default: %(default)s)")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="minimum Jaccard similarity of a cluster (default: %(default)s)")
+    parser.add_argument('--json', metavar='PATH', help="write the report as JSON to PATH")
+    args = parser.parse_args()
+
+    with open(args.file, 'r', encoding='utf-8') as f:
+        questions = json.load(f)
+
+    clusters = find_near_duplicates(questions, args.threshold)
+    conflicts = find_answer_conflicts(questions)
+
+    print(f"Near-duplicate clusters: {len(clusters)} "
+          f"({sum(len(cluster) for cluster in clusters)} questions)")
+    for cluster in clusters:
+        print(f"\n  Cluster of {len(cluster)}:")
+        for position, similarity in cluster:
+            print(f"    {similarity:.2f}  {describe(questions[position])}")
+
+    print(f"\nIdentical questions with conflicting answers: {len(conflicts)}")
+    for conflict in conflicts:
+        print()
+        for position in conflict:
+            question = questions[position]
+            print(f"    {describe(question)}")
+            print(f"      ✓ {question['answers'][question['correctAnswerIndex']]}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(duplicate_report(questions, args.threshold), f, ensure_ascii=False, indent=2)
+        print(f"\nReport saved to: {args.json}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+import hashlib
+import os
+
+# Normalized fill colours that mark the correct answer (yellow highlight)
+CORRECT_ANSWER_COLOURS = {'rgb:FFFF00'}
+ANSWERS_PER_QUESTION = 4
+
+# The legacy 64-colour palette that 'indexed' colours refer to, as RGB
+# (openpyxl.styles.colors.COLOR_INDEX without the alpha byte).  Kept here so
+# normalizing colours doesn't require importing openpyxl.
+INDEXED_COLOURS = (
+    '000000', 'FFFFFF', 'FF0000', '00FF00', '0000FF', 'FFFF00', 'FF00FF', '00FFFF',
+    '000000', 'FFFFFF', 'FF0000', '00FF00', '0000FF', 'FFFF00', 'FF00FF', '00FFFF',
+    '800000', '008000', '000080', '808000', '800080', '008080', 'C0C0C0', '808080',
+    '9999FF', '993366', 'FFFFCC', 'CCFFFF', '660066', 'FF8080', '0066CC', 'CCCCFF',
+    '000080', 'FF00FF', 'FFFF00', '00FFFF', '800080', '800000', '008080', '0000FF',
+    '00CCFF', 'CCFFFF', 'CCFFCC', 'FFFF99', '99CCFF', 'FF99CC', 'CC99FF', 'FFCC99',
+    '3366FF', '33CCCC', '99CC00', 'FFCC00', 'FF9900', 'FF6600', '666699', '969696',
+    '003366', '339966', '003300', '333300', '993300', '993366', '333399', '333333',
+)
+
+def normalize_colour(color):
+    """Normalize an openpyxl Color to 'rgb:RRGGBB', 'indexed:N' or 'theme:N[+tint]'.
+
+    Palette indexes are resolved to their RGB value so the same colour
+    compares equal however it was stored; system colours (64/65) stay indexed.
+    """
+    if color is None:
+        return None
+    if color.type == 'rgb' and isinstance(color.rgb, str):
+        return f"rgb:{color.rgb[-6:].upper()}"
+    if color.type == 'indexed':
+        if 0 <= color.indexed < len(INDEXED_COLOURS):
+            return f"rgb:{INDEXED_COLOURS[color.indexed]}"
+        return f"indexed:{color.indexed}"
+    if color.type == 'theme':
+        return f"theme:{color.theme}" + (f"{color.tint:+.2f}" if color.tint else '')
+    return None
+
+def fill_colour(fill):
+    """Return the normalized colour a fill paints, or None for no fill"""
+    # Gradient fills have no patternType and are never used as highlights
+    pattern_type = getattr(fill, 'patternType', None)
+    if pattern_type in (None, 'none'):
+        return None
+    # For pattern fills the visible colour is the foreground colour
+    return normalize_colour(fill.fgColor)
+
+def build_style_colours(wb):
+    """Map every cell style ID of a workbook to its normalized fill colour.
+
+    Built once per workbook, so resolving an answer cell's colour is a list
+    lookup instead of walking its style objects.
+    """
+    fill_colours = [fill_colour(fill) for fill in wb._fills]
+    return [fill_colours[style.fillId] if style.fillId < len(fill_colours) else None
+            for style in wb._cell_styles]
+
+def load_read_only_workbook(file):
+    """Open a workbook in read-only mode; the caller must close it.
+
+    Read-only mode streams the sheet XML instead of building every cell up
+    front.  openpyxl is imported here rather than at module level, so
+    commands that never open a workbook through it start faster.
+    """
+    import openpyxl
+    return openpyxl.load_workbook(file, read_only=True, data_only=False)
+
+def open_workbook(file):
+    """Open a workbook in read-only mode and return (workbook, style colours)"""
+    wb = load_read_only_workbook(file)
+    return wb, build_style_colours(wb)
+
+def iter_sheet_rows(ws, style_colours, min_row=2):
+    """Yield (row number, column B value, column E value, column E colour) per row.
+
+    Only the first five columns are read, and the fill colour is only looked
+    up for column E cells holding text.  Rows start at min_row, skipping the
+    header row by default.
+    """
+    for row_number, row in enumerate(ws.iter_rows(min_row=min_row, max_col=5), start=min_row):
+        group_value = row[1].value if len(row) > 1 else None
+        text_value = row[4].value if len(row) > 4 else None
+        text_colour = style_colours[row[4]._style_id] if isinstance(text_value, str) else None
+        yield row_number, group_value, text_value, text_colour
+
+def iter_questions(rows, source_file, issues=None, trace=None):
+    """Run the group_title -> question -> answers state machine over rows.
+
+    rows yields (row number, column B, column E, column E colour) tuples as
+    produced by iter_sheet_rows().  Question records are yielded as soon as
+    their fourth answer is read.  A question is only yielded when exactly one
+    of its answers carries the correct-answer fill; otherwise a message is
+    appended to issues (if given) and the question is skipped.
+
+    trace, if given, is called as trace(event, row_number, detail) with the
+    events 'row', 'group', 'question', 'answer', 'extracted' and 'skipped',
+    so debug tools can follow the exact production logic.
+    """
+    step = "group_title"  # Initial step
+    current_group_title = None
+    current_question = None
+    current_answers = []
+    highlighted_answers = []  # Indexes of answers with the correct-answer fill
+
+    for row_number, group_value, text_value, text_colour in rows:
+        if trace:
+            trace('row', row_number, (group_value, text_value, text_colour))
+
+        if step == "group_title":
+            # Look for question group title in Column B
+            if isinstance(group_value, str) and group_value.strip():
+                current_group_title = group_value.strip()
+                if trace:
+                    trace('group', row_number, current_group_title)
+
+                # Check if this same row also has a question in Column E
+                if isinstance(text_value, str) and text_value.strip():
+                    current_question = text_value.strip()
+                    if trace:
+                        trace('question', row_number, current_question)
+                    step = "answers"
+                    current_answers = []
+                    highlighted_answers = []
+                else:
+                    step = "question"
+
+        elif step == "question":
+            # Look for question in Column E
+            if isinstance(text_value, str) and text_value.strip():
+                current_question = text_value.strip()
+                if trace:
+                    trace('question', row_number, current_question)
+                step = "answers"
+                current_answers = []
+                highlighted_answers = []
+
+        elif step == "answers":
+            # Look for answers in Column E
+            if isinstance(text_value, str) and text_value.strip():
+                current_answers.append(text_value.strip())
+                if text_colour in CORRECT_ANSWER_COLOURS:
+                    highlighted_answers.append(len(current_answers) - 1)
+                if trace:
+                    trace('answer', row_number, (len(current_answers), current_answers[-1], text_colour))
+
+                if len(current_answers) >= ANSWERS_PER_QUESTION:
+                    if len(highlighted_answers) == 1:
+                        question_obj = {
+                            "question": current_question,
+                            "answers": current_answers,
+                            "correctAnswerIndex": highlighted_answers[0],
+                            "questionGroup": current_group_title,
+                            "sourceFile": source_file
+                        }
+                        if trace:
+                            trace('extracted', row_number, question_obj)
+                        yield question_obj
+                    else:
+                        problem = "no highlighted answer" if not highlighted_answers else \
+                            f"{len(highlighted_answers)} highlighted answers"
+                        issue = f"{source_file} row {row_number}: {problem}, question skipped: {current_question[:60]}"
+                        if issues is not None:
+                            issues.append(issue)
+                        if trace:
+                            trace('skipped', row_number, issue)
+
+                    # Reset for next question
+                    step = "group_title"
+                    current_question = None
+                    current_answers = []
+                    highlighted_answers = []
+
+# Hex digits kept from the SHA-256 of a question's identity (48 bits)
+ID_LENGTH = 12
+
+def question_identity(question):
+    """Return the fields that identify a question, independent of answer order"""
+    return ([question['sourceFile'], question['questionGroup'] or '', question['question']] +
+            sorted(question['answers']))
+
+def question_id(question):
+    """Return a stable, content-derived ID for a question.
+
+    The ID hashes the source file, group, question text and the set of
+    answers, so it does not change when workbooks are added, listed in a
+    different order or when answer rows are reordered.  The web app keys saved
+    progress by this ID.
+    """
+    key = '\x1f'.join(question_identity(question))
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()[:ID_LENGTH]
+
+def assign_question_ids(questions):
+    """Set the 'id' of every question in place and return detected collisions.
+
+    A question whose ID is already taken (a duplicate question, or a genuine
+    hash collision) gets a numbered suffix so IDs stay unique; each such case
+    is returned as a message for the build summary.
+    """
+    seen = {}
+    collisions = []
+    for question in questions:
+        qid = question_id(question)
+        if qid in seen:
+            other = seen[qid]
+            if question_identity(other) == question_identity(question):
+                kind = "duplicate question"
+            else:
+                kind = "hash collision"
+            suffix = 2
+            while f"{qid}-{suffix}" in seen:
+                suffix += 1
+            new_qid = f"{qid}-{suffix}"
+            collisions.append(f"{kind}: {question['sourceFile']} '{question['question'][:60]}' "
+                              f"collides with {other['sourceFile']} ({qid}), assigned {new_qid}")
+            qid = new_qid
+        seen[qid] = question
+        question['id'] = qid
+    return collisions
+
+def debug_workbook(file_path):
+    """Print every row of a workbook and each step the extraction engine takes on it"""
+    if not os.path.exists(file_path):
+        print(f"File {file_path} not found!")
+        return
+
+    print(f"Debugging: {file_path}")
+    print("=" * 80)
+
+    counts = {'row': 0, 'extracted': 0, 'skipped': 0}
+
+    def trace(event, row_number, detail):
+        if event in counts:
+            counts[event] += 1
+        if event == 'row':
+            print(f"\nRow {row_number}: B={detail[0]!r} E={detail[1]!r} fill={detail[2]}")
+        elif event == 'group':
+            print(f"  → Found question group: {detail}")
+        elif event == 'question':
+            print(f"  → Found question: {detail[:100]}...")
+        elif event == 'answer':
+            number, answer_text, colour = detail
+            print(f"  → Found answer {number}: {answer_text[:50]}... (fill: {colour})")
+        elif event == 'extracted':
+            print(f"  → COMPLETED QUESTION #{counts['extracted']}, correct answer: {detail['correctAnswerIndex']}")
+        elif event == 'skipped':
+            print(f"  → SKIPPED: {detail}")
+
+    wb = None
+    try:
+        wb, style_colours = open_workbook(file_path)
+        ws = wb.active
+        print(f"Sheet name: {ws.title}")
+        print(f"Sheet dimensions: {ws.calculate_dimension()}")
+        print("=" * 80)
+        print("DEBUGGING STATE MACHINE:")
+        print("=" * 80)
+
+        source_file = os.path.basename(file_path)
+        for _ in iter_questions(iter_sheet_rows(ws, style_colours), source_file, trace=trace):
+            pass
+
+        print("\n" + "=" * 80)
+        print(f"DEBUG SUMMARY:")
+        print(f"Rows read: {counts['row']}")
+        print(f"Total questions found: {counts['extracted']}")
+        print(f"Questions skipped: {counts['skipped']}")
+
+    except Exception as e:
+        print(f"Error processing file: {e}")
+    finally:
+        if wb is not None:
+            wb.close()
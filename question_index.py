@@ -0,0 +1,168 @@
+import argparse
+import json
+from bisect import bisect_right
+
+INDEX_FILE = 'public/questions.index.json'
+INDEX_VERSION = 1
+
+def question_section(question):
+    """Return the section a question belongs to ('1' for 1.4.xlsx, '5' for 5.xlsx)"""
+    return question['sourceFile'].split('.', 1)[0]
+
+def section_sort_key(section):
+    """Sort sections numerically where possible ('2' before '10')"""
+    return (0, int(section), '') if section.isdigit() else (1, 0, section)
+
+def build_index(questions):
+    """Build the lookup index for a question list.
+
+    The index maps every ID to its array position and every section to its
+    question count and the [start, end) position ranges it occupies.  The
+    build orders questions by file name so each section is normally one
+    range, but any order is handled.
+    """
+    sections = {}
+    for position, question in enumerate(questions):
+        section = sections.setdefault(question_section(question), {"count": 0, "ranges": []})
+        section["count"] += 1
+        ranges = section["ranges"]
+        if ranges and ranges[-1][1] == position:
+            ranges[-1][1] = position + 1
+        else:
+            ranges.append([position, position + 1])
+
+    return {
+        "version": INDEX_VERSION,
+        "total": len(questions),
+        "ids": [question['id'] for question in questions],
+        "positions": {question['id']: position for position, question in enumerate(questions)},
+        "sections": {section: sections[section] for section in sorted(sections, key=section_sort_key)}
+    }
+
+class QuestionIndex:
+    """Answer ID and section queries from a prebuilt index in O(1) or O(log sections).
+
+    questions is optional; without it only IDs, positions and counts are
+    available, which is enough for progress reporting.
+    """
+
+    def __init__(self, index, questions=None):
+        if index.get('version') != INDEX_VERSION:
+            raise ValueError(f"Unsupported index version: {index.get('version')}")
+        self.index = index
+        self.questions = questions
+        self.ids = index['ids']
+        self.positions = index['positions']
+        # Range starts sorted by position, for mapping a position to its section
+        self._range_starts = []
+        self._range_sections = []
+        for start, end, section in sorted((start, end, section)
+                                          for section, info in index['sections'].items()
+                                          for start, end in info['ranges']):
+            self._range_starts.append(start)
+            self._range_sections.append(section)
+
+    def __len__(self):
+        return self.index['total']
+
+    def sections(self):
+        """Return the section names in display order"""
+        return list(self.index['sections'])
+
+    def position(self, question_id):
+        """Return the array position of an ID, or None if it is not in the bank"""
+        return self.positions.get(question_id)
+
+    def get(self, question_id):
+        """Return the question with this ID, or None"""
+        if self.questions is None:
+            raise ValueError("QuestionIndex was loaded without questions")
+        position = self.positions.get(question_id)
+        return self.questions[position] if position is not None else None
+
+    def section_of(self, question_id):
+        """Return the section of an ID, or None if it is not in the bank"""
+        position = self.positions.get(question_id)
+        if position is None:
+            return None
+        return self._range_sections[bisect_right(self._range_starts, position) - 1]
+
+    def section_count(self, section='all'):
+        """Return the number of questions in a section ('all' for the whole bank)"""
+        if section == 'all':
+            return self.index['total']
+        info = self.index['sections'].get(section)
+        return info['count'] if info else 0
+
+    def section_positions(self, section='all'):
+        """Yield the array positions of a section's questions in bank order"""
+        if section == 'all':
+            yield from range(self.index['total'])
+            return
+        info = self.index['sections'].get(section)
+        for start, end in (info['ranges'] if info else []):
+            yield from range(start, end)
+
+    def section_ids(self, section='all'):
+        """Return the IDs of a section's questions in bank order"""
+        return [self.ids[position] for position in self.section_positions(section)]
+
+    def section_stats(self, answered_ids, correct_ids=(), section='all'):
+        """Count answered and correctly answered IDs that belong to a section.
+
+        Mirrors getSectionStats() in the web app; IDs that are no longer in
+        the bank are ignored.
+        """
+        correct_ids = set(correct_ids)
+        total = correct = 0
+        for question_id in answered_ids:
+            question_section = self.section_of(question_id)
+            if question_section is None or (section != 'all' and question_section != section):
+                continue
+            total += 1
+            if question_id in correct_ids:
+                correct += 1
+        return {"total": total, "correct": correct}
+
+def load_question_index(index_file=INDEX_FILE, questions_file=None):
+    """Load a QuestionIndex from disk, with the full questions if questions_file is given"""
+    with open(index_file, 'r', encoding='utf-8') as f:
+        index = json.load(f)
+    questions = None
+    if questions_file:
+        with open(questions_file, 'r', encoding='utf-8') as f:
+            questions = json.load(f)
+    return QuestionIndex(index, questions)
+
+def main():
+    """Print section counts, or look up questions by ID"""
+    parser = argparse.ArgumentParser(description="Query the prebuilt question index")
+    parser.add_argument('ids', nargs='*', help="question IDs to look up")
+    parser.add_argument('--index', default=INDEX_FILE, help="index file (default: %(default)s)")
+    parser.add_argument('--questions', default='public/questions.json',
+                        help="questions file used to print looked-up questions (default: %(default)s)")
+    args = parser.parse_args()
+
+    try:
+        question_index = load_question_index(args.index, args.questions if args.ids else None)
+    except FileNotFoundError as e:
+        print(f"File not found: {e.filename}. Run 'python process_excel.py --index' first.")
+        return
+
+    if not args.ids:
+        print(f"Total questions: {len(question_index)}")
+        for section in question_index.sections():
+            print(f"  Section {section}: {question_index.section_count(section)} questions")
+        return
+
+    for question_id in args.ids:
+        question = question_index.get(question_id)
+        if question is None:
+            print(f"{question_id}: not found")
+            continue
+        print(f"{question_id}: position {question_index.position(question_id)}, "
+              f"section {question_index.section_of(question_id)}, {question['sourceFile']}")
+        print(f"  {question['question']}")
+
+if __name__ == "__main__":
+    main()
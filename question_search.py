@@ -0,0 +1,183 @@
+import argparse
+import json
+import math
+import re
+from bisect import bisect_left
+
+from question_index import question_section
+
+SEARCH_FILE = 'public/questions.search.json'
+SEARCH_VERSION = 1
+
+# Term weights: words in the question count more than words in the answers
+QUESTION_WEIGHT = 2
+ANSWER_WEIGHT = 1
+# A prefix match scores this fraction of an exact match
+PREFIX_FACTOR = 0.7
+# Saturation constant of the term weight, as in BM25
+WEIGHT_SATURATION = 1.2
+# Longest expansion of one prefix; shorter terms are tried first
+MAX_PREFIX_TERMS = 64
+
+# Armenian emphasis, exclamation, question and abbreviation marks are written
+# inside words (e.g. ինչո՞ւ) and must not split them; the comma ՝ still does
+ARMENIAN_WORD_MARKS = re.compile('[\u055b\u055c\u055e\u055f]')
+# Numbers such as 8/04, 3.5 or 2020-01 stay one token
+TOKEN_PATTERN = re.compile(r'\d+(?:[./-]\d+)*|\w+')
+
+def normalize_text(text):
+    """Casefold Armenian/Latin text and unify spelling variants before tokenizing.
+
+    The ligature և casefolds to եւ; both are indexed as եվ, the reformed
+    spelling, so either form of a query matches either form in the bank.
+    """
+    text = ARMENIAN_WORD_MARKS.sub('', (text or '').casefold())
+    return text.replace('եւ', 'եվ')
+
+def tokenize(text):
+    """Split text into normalized search terms"""
+    return TOKEN_PATTERN.findall(normalize_text(text))
+
+def build_search_index(questions):
+    """Build an inverted index over question and answer text.
+
+    Terms are sorted so prefixes can be found by binary search.  The
+    postings of each term are flattened [position delta, weight, ...] pairs
+    in position order; weight sums QUESTION_WEIGHT per occurrence in the
+    question and ANSWER_WEIGHT per occurrence in an answer.
+    """
+    postings = {}
+    for position, question in enumerate(questions):
+        weights = {}
+        for term in tokenize(question['question']):
+            weights[term] = weights.get(term, 0) + QUESTION_WEIGHT
+        for answer in question['answers']:
+            for term in tokenize(answer):
+                weights[term] = weights.get(term, 0) + ANSWER_WEIGHT
+        for term, weight in weights.items():
+            postings.setdefault(term, []).append((position, weight))
+
+    terms = sorted(postings)
+    encoded = []
+    for term in terms:
+        flat = []
+        previous = 0
+        for position, weight in postings[term]:
+            flat.extend((position - previous, weight))
+            previous = position
+        encoded.append(flat)
+
+    return {
+        "version": SEARCH_VERSION,
+        "total": len(questions),
+        "ids": [question['id'] for question in questions],
+        "sections": [question_section(question) for question in questions],
+        "terms": terms,
+        "postings": encoded
+    }
+
+class SearchIndex:
+    """Ranked search over a prebuilt index.
+
+    Every query term matches index terms equal to it or starting with it
+    (so inflected Armenian forms like կանոնակարգի match կանոնակարգ);
+    scores sum idf x saturated weight per query term, with prefix matches
+    discounted.  Postings are decoded once when the index is loaded.
+    """
+
+    def __init__(self, index):
+        if index.get('version') != SEARCH_VERSION:
+            raise ValueError(f"Unsupported search index version: {index.get('version')}")
+        self.total = index['total']
+        self.ids = index['ids']
+        self.sections = index['sections']
+        self.terms = index['terms']
+        self.postings = []
+        for flat in index['postings']:
+            decoded = []
+            position = 0
+            for i in range(0, len(flat), 2):
+                position += flat[i]
+                decoded.append((position, flat[i + 1]))
+            self.postings.append(decoded)
+        self._idf = [math.log(1 + (self.total - len(postings) + 0.5) / (len(postings) + 0.5))
+                     for postings in self.postings]
+
+    def matching_terms(self, token):
+        """Return the index numbers of terms equal to or starting with token, exact match first"""
+        start = bisect_left(self.terms, token)
+        end = start
+        while end < len(self.terms) and self.terms[end].startswith(token):
+            end += 1
+        if end - start <= MAX_PREFIX_TERMS:
+            return list(range(start, end))
+        return sorted(range(start, end), key=lambda number: len(self.terms[number]))[:MAX_PREFIX_TERMS]
+
+    def search(self, query, limit=10, section=None):
+        """Return up to limit (id, score) pairs, best first, where every query term matches.
+
+        section restricts results to one section ('1' for 1.x.xlsx files).
+        """
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            return []
+
+        scores = None
+        for token in tokens:
+            token_scores = {}
+            for number in self.matching_terms(token):
+                factor = 1.0 if self.terms[number] == token else PREFIX_FACTOR
+                idf = self._idf[number] * factor
+                for position, weight in self.postings[number]:
+                    score = idf * weight * (WEIGHT_SATURATION + 1) / (weight + WEIGHT_SATURATION)
+                    if score > token_scores.get(position, 0):
+                        token_scores[position] = score
+            if scores is None:
+                scores = token_scores
+            else:
+                scores = {position: score + token_scores[position]
+                          for position, score in scores.items() if position in token_scores}
+            if not scores:
+                return []
+
+        if section is not None:
+            scores = {position: score for position, score in scores.items()
+                      if self.sections[position] == section}
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:limit]
+        return [(self.ids[position], round(score, 4)) for position, score in ranked]
+
+def load_search_index(path=SEARCH_FILE):
+    """Load a SearchIndex from disk"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return SearchIndex(json.load(f))
+
+def main():
+    """Search the bank from the command line"""
+    parser = argparse.ArgumentParser(description="Ranked full-text search over the question bank")
+    parser.add_argument('query', nargs='+', help="search terms; each term also matches longer words")
+    parser.add_argument('--index', default=SEARCH_FILE, help="search index (default: %(default)s)")
+    parser.add_argument('--questions', default='public/questions.json',
+                        help="questions file used to print results (default: %(default)s)")
+    parser.add_argument('--section', help="only search this section")
+    parser.add_argument('--limit', type=int, default=10, help="number of results (default: 10)")
+    args = parser.parse_args()
+
+    try:
+        search_index = load_search_index(args.index)
+    except FileNotFoundError as e:
+        print(f"File not found: {e.filename}. Run 'python process_excel.py --search' first.")
+        return
+    with open(args.questions, 'r', encoding='utf-8') as f:
+        questions = {question['id']: question for question in json.load(f)}
+
+    query = ' '.join(args.query)
+    results = search_index.search(query, limit=args.limit, section=args.section)
+    print(f"{len(results)} results for: {query}")
+    for question_id, score in results:
+        question = questions.get(question_id)
+        text = question['question'] if question else '(not in questions file)'
+        source = question['sourceFile'] if question else '?'
+        print(f"  {score:>7.2f}  {question_id} ({source}): {text[:90]}")
+
+if __name__ == "__main__":
+    main()
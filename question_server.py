@@ -0,0 +1,240 @@
+import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+import random
+from functools import lru_cache
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from exam_generator import PaperSampler, allocate_quotas, section_pools
+from question_index import build_index, question_section
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8000
+# Responses smaller than this are not worth compressing
+GZIP_MIN_SIZE = 512
+MAX_HEADER_BYTES = 16 * 1024
+MAX_EXAM_SIZE = 500
+# Seeded exams are deterministic; keep the most recently requested ones ready
+EXAM_CACHE_SIZE = 256
+
+REASONS = {200: 'OK', 304: 'Not Modified', 400: 'Bad Request', 404: 'Not Found',
+           405: 'Method Not Allowed', 431: 'Request Header Fields Too Large'}
+
+def encode_body(data):
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+class Resource:
+    """A response body with its strong ETag and gzip variant, prepared once"""
+
+    __slots__ = ('body', 'etag', 'gzip_body', 'gzip_etag')
+
+    def __init__(self, data):
+        self.body = encode_body(data)
+        digest = hashlib.sha256(self.body).hexdigest()[:24]
+        self.etag = f'"{digest}"'
+        if len(self.body) >= GZIP_MIN_SIZE:
+            self.gzip_body = gzip.compress(self.body, compresslevel=6, mtime=0)
+            # A strong ETag identifies the exact bytes, so each encoding gets its own
+            self.gzip_etag = f'"{digest}-gzip"'
+        else:
+            self.gzip_body = None
+            self.gzip_etag = None
+
+def error_resource(message):
+    return Resource({"error": message})
+
+class QuestionAPI:
+    """The bank loaded once into lookup tables, with cacheable responses prebuilt.
+
+    /questions/{id} and /sections/{prefix} are served from ready-made
+    bodies; /random and /exam draw from per-section position lists.  An
+    /exam with a seed is deterministic and therefore cacheable.
+    """
+
+    def __init__(self, questions):
+        self.questions = questions
+        index = build_index(questions)
+        self.pools = section_pools(questions)
+        self.by_id = {question['id']: Resource(question) for question in questions}
+
+        # A prefix is a section ('1'), a workbook ('1.4') or the whole bank ('all')
+        groups = {'all': list(range(len(questions)))}
+        for position, question in enumerate(questions):
+            groups.setdefault(question_section(question), []).append(position)
+            workbook = question['sourceFile'].rsplit('.', 1)[0]
+            if workbook != question_section(question):
+                groups.setdefault(workbook, []).append(position)
+        self.groups = groups
+        self.by_prefix = {prefix: Resource({"prefix": prefix, "count": len(positions),
+                                            "questions": [questions[position] for position in positions]})
+                          for prefix, positions in groups.items()}
+        self.sections = Resource({"total": len(questions),
+                                  "sections": {section: info['count'] for section, info in index['sections'].items()}})
+        self.not_found = error_resource("not found")
+        self.rng = random.Random()
+        self.seeded_exam = lru_cache(maxsize=EXAM_CACHE_SIZE)(self.build_exam)
+
+    def route(self, target):
+        """Return (status, Resource, cacheable) for a request target"""
+        parts = urlsplit(target)
+        path = unquote(parts.path).rstrip('/') or '/'
+        query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+
+        if path.startswith('/questions/'):
+            resource = self.by_id.get(path[len('/questions/'):])
+            return (200, resource, True) if resource else (404, self.not_found, False)
+        if path == '/sections':
+            return 200, self.sections, True
+        if path.startswith('/sections/'):
+            resource = self.by_prefix.get(path[len('/sections/'):])
+            return (200, resource, True) if resource else (404, self.not_found, False)
+        if path == '/random':
+            positions = self.groups.get(query.get('section', 'all'))
+            if not positions:
+                return 404, error_resource("unknown section"), False
+            question = self.questions[self.rng.choice(positions)]
+            return 200, self.by_id[question['id']], False
+        if path == '/exam':
+            return self.exam(query)
+        return 404, self.not_found, False
+
+    def exam(self, query):
+        """A stratified paper of n questions; repeatable and cacheable when seed is given"""
+        try:
+            size = int(query.get('n', 80))
+            seed = int(query['seed']) if 'seed' in query else None
+        except ValueError:
+            return 400, error_resource("n and seed must be integers"), False
+        section = query.get('section')
+        if section is not None and section not in self.pools:
+            return 404, error_resource("unknown section"), False
+        pools = {section: self.pools[section]} if section else self.pools
+        if not 0 < size <= min(MAX_EXAM_SIZE, sum(len(pool) for pool in pools.values())):
+            return 400, error_resource("n is out of range"), False
+
+        if seed is None:
+            # The drawn seed is returned so the paper can be requested again
+            return 200, self.build_exam(size, section, self.rng.getrandbits(32)), False
+        return 200, self.seeded_exam(size, section, seed), True
+
+    def build_exam(self, size, section, seed):
+        pools = {section: self.pools[section]} if section else self.pools
+        quotas = allocate_quotas(pools, size)
+        paper = PaperSampler(pools, quotas, seed, use_numpy=False).batch(1)[0]
+        return Resource({"n": size, "seed": seed, "quotas": quotas,
+                         "questions": [self.questions[position] for position in paper]})
+
+def etag_matches(header, *etags):
+    """True if an If-None-Match header lists any of the given ETags (or is '*').
+
+    If-None-Match uses weak comparison, so a W/ prefix is ignored.
+    """
+    if header is None:
+        return False
+    tags = {tag.strip().removeprefix('W/') for tag in header.split(',')}
+    return '*' in tags or any(etag in tags for etag in etags if etag)
+
+def build_response(status, resource, cacheable, headers, head_only=False):
+    """Serialize a response, handling conditional GET and gzip negotiation"""
+    use_gzip = resource.gzip_body is not None and 'gzip' in headers.get('accept-encoding', '')
+    etag = resource.gzip_etag if use_gzip else resource.etag
+    lines = [f"HTTP/1.1 {status} {REASONS[status]}", "Content-Type: application/json; charset=utf-8"]
+    if cacheable:
+        lines += [f"ETag: {etag}", "Cache-Control: no-cache", "Vary: Accept-Encoding"]
+        if status == 200 and etag_matches(headers.get('if-none-match'), resource.etag, resource.gzip_etag):
+            return (f"HTTP/1.1 304 Not Modified\r\nETag: {etag}\r\nCache-Control: no-cache\r\n"
+                    f"Vary: Accept-Encoding\r\n\r\n").encode('latin-1')
+    else:
+        lines.append("Cache-Control: no-store")
+    body = resource.gzip_body if use_gzip else resource.body
+    if use_gzip:
+        lines.append("Content-Encoding: gzip")
+    lines.append(f"Content-Length: {len(body)}")
+    head = ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1')
+    return head if head_only else head + body
+
+async def read_request(reader):
+    """Read one request head; return (method, target, version, headers) or None at EOF"""
+    try:
+        head = await reader.readuntil(b'\r\n\r\n')
+    except asyncio.IncompleteReadError:
+        return None
+    except asyncio.LimitOverrunError:
+        raise ValueError(431)
+    lines = head.decode('latin-1').split('\r\n')
+    try:
+        method, target, version = lines[0].split(' ')
+    except ValueError:
+        raise ValueError(400)
+    headers = {}
+    for line in lines[1:]:
+        if line:
+            name, _, value = line.partition(':')
+            headers[name.strip().lower()] = value.strip()
+    try:
+        length = int(headers.get('content-length') or 0)
+    except ValueError:
+        raise ValueError(400)
+    if length:
+        await reader.readexactly(length)
+    return method, target, version, headers
+
+def make_handler(api):
+    """Return the connection callback for asyncio.start_server"""
+
+    async def handle(reader, writer):
+        try:
+            while True:
+                try:
+                    request = await read_request(reader)
+                except ValueError as e:
+                    status = e.args[0]
+                    writer.write(build_response(status, error_resource(REASONS[status]), False, {}))
+                    break
+                if request is None:
+                    break
+                method, target, version, headers = request
+                if method in ('GET', 'HEAD'):
+                    status, resource, cacheable = api.route(target)
+                else:
+                    status, resource, cacheable = 405, error_resource("only GET and HEAD"), False
+                writer.write(build_response(status, resource, cacheable, headers, method == 'HEAD'))
+                keep_alive = (headers.get('connection', '').lower() != 'close'
+                              if version == 'HTTP/1.1' else headers.get('connection', '').lower() == 'keep-alive')
+                if not keep_alive:
+                    break
+                await writer.drain()
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    return handle
+
+async def serve(api, host=DEFAULT_HOST, port=DEFAULT_PORT):
+    server = await asyncio.start_server(make_handler(api), host, port, limit=MAX_HEADER_BYTES)
+    print(f"Serving {len(api.questions)} questions on http://{host}:{port}")
+    print("  /questions/{id}  /sections  /sections/{prefix}  /random?section=  /exam?n=&section=&seed=")
+    async with server:
+        await server.serve_forever()
+
+def main():
+    """Serve the built question bank over HTTP"""
+    parser = argparse.ArgumentParser(description="Local question API server")
+    parser.add_argument('--host', default=DEFAULT_HOST, help="address to bind (default: %(default)s)")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help="port (default: %(default)s)")
+    parser.add_argument('--questions', default='public/questions.json', help="question bank (default: %(default)s)")
+    args = parser.parse_args()
+
+    with open(args.questions, 'r', encoding='utf-8') as f:
+        api = QuestionAPI(json.load(f))
+    try:
+        asyncio.run(serve(api, args.host, args.port))
+    except KeyboardInterrupt:
+        print("\nServer stopped")
+
+if __name__ == "__main__":
+    main()
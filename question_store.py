@@ -0,0 +1,276 @@
+import argparse
+import json
+import mmap
+import struct
+import zlib
+
+from build_io import atomic_write
+from question_index import build_index, question_section
+
+STORE_FILE = 'public/questions.bin'
+MAGIC = b'BQST'
+STORE_VERSION = 1
+
+# magic, version, flags, count, meta offset, meta length, record table offset,
+# hash table offset, hash table slots, string blob offset
+HEADER = struct.Struct('<4sHHIIIIIII')
+# blob offset, blob length, correctAnswerIndex, answer count, section number
+RECORD = struct.Struct('<IIBBH')
+SLOT = struct.Struct('<I')
+# Length marker for a None string (questionGroup may be missing)
+NONE_LENGTH = 0xFFFFFFFF
+# Fields stored before the answers in every record
+FIXED_FIELDS = ('id', 'question', 'questionGroup', 'sourceFile')
+
+def id_hash(question_id):
+    """Hash used for the on-disk ID table"""
+    return zlib.crc32(question_id.encode('utf-8'))
+
+def encode_record(question):
+    """Encode a question's strings as a u32 length table followed by the UTF-8 bytes"""
+    strings = [question[field] for field in FIXED_FIELDS] + list(question['answers'])
+    encoded = [value.encode('utf-8') if value is not None else None for value in strings]
+    lengths = [len(value) if value is not None else NONE_LENGTH for value in encoded]
+    return struct.pack(f'<{len(lengths)}I', *lengths) + b''.join(value for value in encoded if value)
+
+def write_store(questions, path):
+    """Write questions to a binary store and return its size in bytes.
+
+    Layout: header, a small JSON block with the section ranges, a fixed-width
+    record table (one entry per question, in bank order), an open-addressing
+    ID hash table pointing into the record table, then the string blob.
+    """
+    index = build_index(questions)
+    section_names = list(index['sections'])
+    section_numbers = {name: number for number, name in enumerate(section_names)}
+    meta = json.dumps({"sections": index['sections']}, ensure_ascii=False,
+                      separators=(',', ':')).encode('utf-8')
+
+    blobs = []
+    records = []
+    blob_size = 0
+    for question in questions:
+        if len(question['answers']) > 255:
+            raise ValueError(f"Question {question['id']} has too many answers to store")
+        blob = encode_record(question)
+        records.append(RECORD.pack(blob_size, len(blob), question['correctAnswerIndex'],
+                                   len(question['answers']), section_numbers[question_section(question)]))
+        blobs.append(blob)
+        blob_size += len(blob)
+
+    # Power-of-two table at most half full keeps probe sequences short
+    slots = 1
+    while slots < 2 * max(len(questions), 1):
+        slots *= 2
+    table = [0] * slots
+    for position, question in enumerate(questions):
+        slot = id_hash(question['id']) & (slots - 1)
+        while table[slot]:
+            slot = (slot + 1) & (slots - 1)
+        table[slot] = position + 1  # 0 marks an empty slot
+
+    meta_offset = HEADER.size
+    table_offset = meta_offset + len(meta)
+    hash_offset = table_offset + RECORD.size * len(records)
+    blob_offset = hash_offset + SLOT.size * slots
+    header = HEADER.pack(MAGIC, STORE_VERSION, 0, len(questions), meta_offset, len(meta),
+                         table_offset, hash_offset, slots, blob_offset)
+
+    # Written beside the target and renamed, so open readers never see a partial store
+    atomic_write(path, b''.join([header, meta, *records, struct.pack(f'<{slots}I', *table), *blobs]))
+    return blob_offset + blob_size
+
+class QuestionView:
+    """Lazy view of one stored question; strings are decoded on first access"""
+
+    __slots__ = ('_store', 'position', '_start', 'correctAnswerIndex', '_answer_count',
+                 '_section', '_lengths', '_offsets')
+
+    def __init__(self, store, position):
+        self._store = store
+        self.position = position
+        start, _, self.correctAnswerIndex, self._answer_count, self._section = \
+            RECORD.unpack_from(store._mm, store._table_offset + position * RECORD.size)
+        self._start = store._blob_offset + start
+        self._lengths = None
+        self._offsets = None
+
+    def _string(self, field_number):
+        if self._lengths is None:
+            count = len(FIXED_FIELDS) + self._answer_count
+            self._lengths = struct.unpack_from(f'<{count}I', self._store._mm, self._start)
+            offsets = []
+            offset = self._start + 4 * count
+            for length in self._lengths:
+                offsets.append(offset)
+                if length != NONE_LENGTH:
+                    offset += length
+            self._offsets = offsets
+        length = self._lengths[field_number]
+        if length == NONE_LENGTH:
+            return None
+        offset = self._offsets[field_number]
+        return self._store._mm[offset:offset + length].decode('utf-8')
+
+    @property
+    def id(self):
+        return self._string(0)
+
+    @property
+    def question(self):
+        return self._string(1)
+
+    @property
+    def questionGroup(self):
+        return self._string(2)
+
+    @property
+    def sourceFile(self):
+        return self._string(3)
+
+    @property
+    def section(self):
+        return self._store.sections[self._section]
+
+    @property
+    def answers(self):
+        return [self._string(len(FIXED_FIELDS) + i) for i in range(self._answer_count)]
+
+    def to_dict(self):
+        """Return the question in the questions.json schema"""
+        return {
+            "question": self.question,
+            "answers": self.answers,
+            "correctAnswerIndex": self.correctAnswerIndex,
+            "questionGroup": self.questionGroup,
+            "sourceFile": self.sourceFile,
+            "id": self.id
+        }
+
+    def __repr__(self):
+        return f"<QuestionView {self.position} {self.id}>"
+
+class QuestionStore:
+    """Read-only, memory-mapped access to a binary question store.
+
+    Opening the store maps the file and reads only the header and section
+    ranges; question N, a lookup by ID or one section's questions touch only
+    the pages they need.
+    """
+
+    def __init__(self, path=STORE_FILE):
+        self._file = open(path, 'rb')
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._file.close()
+            raise
+        (magic, version, _, self._count, meta_offset, meta_length, self._table_offset,
+         self._hash_offset, self._hash_slots, self._blob_offset) = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != STORE_VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a version {STORE_VERSION} question store")
+        meta = json.loads(self._mm[meta_offset:meta_offset + meta_length].decode('utf-8'))
+        self.section_ranges = meta['sections']
+        self.sections = list(self.section_ranges)
+
+    def close(self):
+        self._mm.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, position):
+        if position < 0:
+            position += self._count
+        if not 0 <= position < self._count:
+            raise IndexError(position)
+        return QuestionView(self, position)
+
+    def __iter__(self):
+        for position in range(self._count):
+            yield QuestionView(self, position)
+
+    def position(self, question_id):
+        """Return the position of an ID, or None; one hash probe in the common case"""
+        mask = self._hash_slots - 1
+        slot = id_hash(question_id) & mask
+        while True:
+            entry = SLOT.unpack_from(self._mm, self._hash_offset + slot * SLOT.size)[0]
+            if entry == 0:
+                return None
+            if QuestionView(self, entry - 1).id == question_id:
+                return entry - 1
+            slot = (slot + 1) & mask
+
+    def get(self, question_id):
+        """Return a view of the question with this ID, or None"""
+        position = self.position(question_id)
+        return QuestionView(self, position) if position is not None else None
+
+    def iter_section(self, section):
+        """Yield views of one section's questions in bank order"""
+        info = self.section_ranges.get(section)
+        for start, end in (info['ranges'] if info else []):
+            for position in range(start, end):
+                yield QuestionView(self, position)
+
+def store_to_questions(path):
+    """Read a whole store back into the questions.json schema"""
+    with QuestionStore(path) as store:
+        return [view.to_dict() for view in store]
+
+def main():
+    """Convert between questions.json and the binary store, or look up questions"""
+    parser = argparse.ArgumentParser(description="Binary question store tools")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build = subparsers.add_parser('build', help="convert questions.json to a store")
+    build.add_argument('source', nargs='?', default='public/questions.json')
+    build.add_argument('store', nargs='?', default=STORE_FILE)
+
+    export = subparsers.add_parser('export', help="convert a store back to questions.json format")
+    export.add_argument('store', nargs='?', default=STORE_FILE)
+    export.add_argument('output', nargs='?', default='-', help="output file (default: stdout)")
+
+    get = subparsers.add_parser('get', help="print questions by ID")
+    get.add_argument('ids', nargs='+')
+    get.add_argument('--store', default=STORE_FILE)
+
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        with open(args.source, 'r', encoding='utf-8') as f:
+            questions = json.load(f)
+        size = write_store(questions, args.store)
+        print(f"Wrote {len(questions)} questions to {args.store} ({size:,} bytes)")
+    elif args.command == 'export':
+        payload = json.dumps(store_to_questions(args.store), ensure_ascii=False, indent=2)
+        if args.output == '-':
+            print(payload)
+        else:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                f.write(payload)
+            print(f"Exported {args.store} to {args.output}")
+    elif args.command == 'get':
+        with QuestionStore(args.store) as store:
+            for question_id in args.ids:
+                view = store.get(question_id)
+                if view is None:
+                    print(f"{question_id}: not found")
+                    continue
+                print(f"{question_id}: position {view.position}, section {view.section}, {view.sourceFile}")
+                print(f"  {view.question}")
+                for i, answer in enumerate(view.answers):
+                    marker = "✓" if i == view.correctAnswerIndex else " "
+                    print(f"  {marker} {i + 1}. {answer}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,269 @@
+import argparse
+import gzip
+import hashlib
+import json
+import os
+
+from build_io import atomic_write, encode_json
+
+VERSIONS_DIR = 'public/versions'
+MANIFEST_FILE = 'manifest.json'
+VERSIONS_FORMAT = 1
+# Versions a client can still update from with a patch; older clients
+# download the full questions.json
+MAX_VERSIONS = 20
+
+def encode_question(question):
+    # Compared as bytes, so a change in key order also counts as a modification
+    return json.dumps(question, ensure_ascii=False, separators=(',', ':'))
+
+def make_patch(old, new, from_entry, to_entry):
+    """Return the patch turning the old question list into the new one.
+
+    Questions are keyed by ID.  Since IDs hash the question text, group and
+    answer set, an edited question usually shows up as removed + added;
+    'modified' holds questions whose ID is unchanged but whose other fields
+    (the correct answer, the answer order) differ.  'order' rebuilds the new
+    list: [start, count] copies a run of the old list by position, a string
+    is the ID of an added question.
+    """
+    old_positions = {question['id']: position for position, question in enumerate(old)}
+    new_ids = {question['id'] for question in new}
+    removed = [question['id'] for question in old if question['id'] not in new_ids]
+    added = []
+    modified = []
+    order = []
+    for question in new:
+        position = old_positions.get(question['id'])
+        if position is None:
+            added.append(question)
+            order.append(question['id'])
+            continue
+        if encode_question(question) != encode_question(old[position]):
+            modified.append(question)
+        last = order[-1] if order else None
+        if isinstance(last, list) and last[0] + last[1] == position:
+            last[1] += 1
+        else:
+            order.append([position, 1])
+    return {
+        "format": VERSIONS_FORMAT,
+        "from": from_entry['version'],
+        "to": to_entry['version'],
+        "fromSha256": from_entry['sha256'],
+        "sha256": to_entry['sha256'],
+        "minified": to_entry['minified'],
+        "removed": removed,
+        "added": added,
+        "modified": modified,
+        "order": order
+    }
+
+def apply_patch(questions, patch):
+    """Return the question list a patch produces from the list of its 'from' version"""
+    by_id = {question['id']: question for question in questions}
+    for qid in patch['removed']:
+        del by_id[qid]
+    for question in patch['modified'] + patch['added']:
+        by_id[question['id']] = question
+    result = []
+    for item in patch['order']:
+        if isinstance(item, str):
+            result.append(by_id[item])
+        else:
+            start, count = item
+            result.extend(by_id[question['id']] for question in questions[start:start + count])
+    return result
+
+def write_file(path, payload):
+    """Write bytes atomically so clients never fetch a partial patch or manifest"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    atomic_write(path, payload)
+
+def load_manifest(versions_dir=VERSIONS_DIR):
+    """Return the versions manifest, or None when there is no version history yet"""
+    try:
+        with open(os.path.join(versions_dir, MANIFEST_FILE), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return None
+    if manifest.get('format') != VERSIONS_FORMAT:
+        raise ValueError(f"Unsupported versions format: {manifest.get('format')}")
+    return manifest
+
+def snapshot_path(versions_dir, version):
+    return os.path.join(versions_dir, 'snapshots', f"{version}.json.gz")
+
+def read_snapshot(versions_dir, version):
+    """Return the exact questions.json bytes of a version"""
+    with open(snapshot_path(versions_dir, version), 'rb') as f:
+        return gzip.decompress(f.read())
+
+def read_patch(versions_dir, name):
+    with open(os.path.join(versions_dir, name), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def patch_name(from_version, to_version):
+    return f"patches/{from_version}-{to_version}.json"
+
+def publish_version(questions, versions_dir=VERSIONS_DIR, minify=False, keep=MAX_VERSIONS):
+    """Record the built bank as a new version unless it is unchanged; return a report or None.
+
+    Each version keeps a gzipped snapshot of its questions.json bytes.  A
+    new version gets a patch from its predecessor ('next') and every older
+    retained version gets a patch straight to it ('latest'), so any client
+    updates with a single request.  Only the newest keep versions are
+    retained.  The manifest is written last: it never points at a file
+    that is not there yet.
+    """
+    payload = encode_json(questions, minify)
+    sha256 = hashlib.sha256(payload).hexdigest()
+    manifest = load_manifest(versions_dir) or {"format": VERSIONS_FORMAT, "latest": 0, "versions": []}
+    if manifest['versions'] and manifest['versions'][-1]['sha256'] == sha256:
+        return None
+
+    entry = {"version": manifest['latest'] + 1, "sha256": sha256, "minified": minify,
+             "count": len(questions), "bytes": len(payload),
+             "snapshot": f"snapshots/{manifest['latest'] + 1}.json.gz"}
+    write_file(snapshot_path(versions_dir, entry['version']), gzip.compress(payload, mtime=0))
+
+    versions = []
+    report = {"version": entry['version'], "bytes": len(payload)}
+    for old_entry in manifest['versions'][-(keep - 1):] if keep > 1 else []:
+        try:
+            old = json.loads(read_snapshot(versions_dir, old_entry['version']))
+        except (OSError, ValueError):
+            # Without its snapshot a version can't be patched; those clients fetch the full bank
+            continue
+        patch = make_patch(old, questions, old_entry, entry)
+        patch_payload = encode_json(patch, minify=True)
+        name = patch_name(old_entry['version'], entry['version'])
+        write_file(os.path.join(versions_dir, name), patch_payload)
+        patch_info = {"file": name, "bytes": len(patch_payload)}
+        if old_entry is manifest['versions'][-1]:
+            old_entry['next'] = patch_info
+            old_entry.pop('latest', None)
+            report.update(added=len(patch['added']), removed=len(patch['removed']),
+                          modified=len(patch['modified']), patchBytes=len(patch_payload))
+        else:
+            old_entry['latest'] = patch_info
+        versions.append(old_entry)
+    versions.append(entry)
+
+    manifest = {"format": VERSIONS_FORMAT, "latest": entry['version'], "sha256": sha256, "versions": versions}
+    write_file(os.path.join(versions_dir, MANIFEST_FILE), encode_json(manifest))
+
+    # Drop snapshots and patches of retired versions and superseded 'latest' patches
+    referenced = {item['snapshot'] for item in versions}
+    referenced.update(item[key]['file'] for item in versions for key in ('next', 'latest') if key in item)
+    for folder in ('snapshots', 'patches'):
+        folder_path = os.path.join(versions_dir, folder)
+        for name in os.listdir(folder_path) if os.path.isdir(folder_path) else []:
+            if f"{folder}/{name}" not in referenced:
+                os.remove(os.path.join(versions_dir, folder, name))
+    return report
+
+def update_questions(questions, version, versions_dir=VERSIONS_DIR, manifest=None):
+    """Bring the questions of a version up to the latest one; return (questions, patch files applied).
+
+    The direct patch to the latest version is used when there is one,
+    otherwise the chain of 'next' patches is followed.
+    """
+    manifest = manifest or load_manifest(versions_dir)
+    entries = {entry['version']: entry for entry in manifest['versions']}
+    if version not in entries:
+        raise ValueError(f"Version {version} is not retained; download the full bank")
+    applied = []
+    while version != manifest['latest']:
+        entry = entries[version]
+        step = entry.get('latest') or entry['next']
+        patch = read_patch(versions_dir, step['file'])
+        if patch['fromSha256'] != entry['sha256']:
+            raise ValueError(f"{step['file']} does not apply to version {version}")
+        questions = apply_patch(questions, patch)
+        applied.append(step['file'])
+        version = patch['to']
+    return questions, applied
+
+def verify_versions(versions_dir=VERSIONS_DIR, questions_file=None):
+    """Check every retained version updates to the latest build byte for byte; return the problems found"""
+    manifest = load_manifest(versions_dir)
+    if manifest is None:
+        return [f"No version history in {versions_dir}"]
+    problems = []
+    latest = manifest['versions'][-1]
+    expected = read_snapshot(versions_dir, latest['version'])
+    if questions_file is not None:
+        with open(questions_file, 'rb') as f:
+            if f.read() != expected:
+                problems.append(f"{questions_file} is not the latest version ({latest['version']})")
+    for entry in manifest['versions']:
+        payload = read_snapshot(versions_dir, entry['version'])
+        if hashlib.sha256(payload).hexdigest() != entry['sha256']:
+            problems.append(f"snapshot of version {entry['version']} does not match its SHA-256")
+            continue
+        questions = json.loads(payload)
+        routes = {'direct': update_questions(questions, entry['version'], versions_dir, manifest)[0]}
+        if entry.get('latest'):
+            # Also walk the chain of 'next' patches one version at a time
+            entries = {item['version']: item for item in manifest['versions']}
+            chain = questions
+            version = entry['version']
+            while version != manifest['latest']:
+                patch = read_patch(versions_dir, entries[version]['next']['file'])
+                chain = apply_patch(chain, patch)
+                version = patch['to']
+            routes['chain'] = chain
+        for route, result in routes.items():
+            if encode_json(result, latest['minified']) != expected:
+                problems.append(f"version {entry['version']} -> {latest['version']} ({route}) "
+                                f"does not reproduce the build")
+    return problems
+
+def main():
+    """Inspect, verify or apply the versioned patches of the question bank"""
+    parser = argparse.ArgumentParser(description="Versioned question bank snapshots and delta patches")
+    parser.add_argument('--versions', default=VERSIONS_DIR, help="versions directory (default: %(default)s)")
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('list', help="list retained versions and patch sizes")
+    verify = commands.add_parser('verify', help="check that every version patches to the latest build byte for byte")
+    verify.add_argument('--questions', default='public/questions.json',
+                        help="full build to compare against (default: %(default)s)")
+    apply = commands.add_parser('apply', help="update an older questions.json to the latest version")
+    apply.add_argument('file', help="questions.json of a retained version")
+    apply.add_argument('-o', '--output', help="where to write the result (default: overwrite file)")
+    args = parser.parse_args()
+
+    manifest = load_manifest(args.versions)
+    if manifest is None:
+        print(f"No version history in {args.versions}; build with process_excel.py --versions")
+        return
+
+    if args.command == 'list':
+        for entry in manifest['versions']:
+            patches = ', '.join(f"{key} {entry[key]['file']} ({entry[key]['bytes']:,} bytes)"
+                                for key in ('next', 'latest') if key in entry)
+            print(f"  v{entry['version']}: {entry['count']} questions, {entry['bytes']:,} bytes"
+                  + (f"; {patches}" if patches else " (latest)"))
+    elif args.command == 'verify':
+        problems = verify_versions(args.versions, args.questions)
+        for problem in problems:
+            print(f"  {problem}")
+        if problems:
+            raise SystemExit(1)
+        print(f"All {len(manifest['versions'])} versions reproduce version {manifest['latest']} byte for byte")
+    else:
+        with open(args.file, 'rb') as f:
+            payload = f.read()
+        sha256 = hashlib.sha256(payload).hexdigest()
+        version = next((entry['version'] for entry in manifest['versions'] if entry['sha256'] == sha256), None)
+        if version is None:
+            print(f"{args.file} is not a retained version; download the full bank")
+            return
+        questions, applied = update_questions(json.loads(payload), version, args.versions, manifest)
+        output = args.output or args.file
+        write_file(os.path.abspath(output), encode_json(questions, manifest['versions'][-1]['minified']))
+        print(f"Updated version {version} to {manifest['latest']} with {len(applied)} patch(es): {output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+import argparse
+import json
+import os
+import time
+
+from build_io import atomic_write, encode_json, file_sha256
+from xlsx_reader import UnsupportedWorkbook, XlsxReader
+
+SHEET_CACHE_DIR = '.cache/sheets'
+# Bump when the cached row format changes
+SHEET_CACHE_VERSION = 1
+DEFAULT_COLUMNS = 10
+
+def column_letter(number):
+    """Column letter(s) for a 1-based column number"""
+    letters = ''
+    while number:
+        number, remainder = divmod(number - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+def json_value(value):
+    """Cell values the sidecar can store; dates and times read by openpyxl become ISO strings"""
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return value.isoformat() if hasattr(value, 'isoformat') else str(value)
+
+def read_rows_openpyxl(file, min_row=1, max_row=None):
+    """read_rows() through openpyxl, for workbooks the direct reader does not support"""
+    from openpyxl.cell.read_only import EmptyCell
+    from question_extractor import open_workbook
+
+    wb, style_colours = open_workbook(file)
+    try:
+        rows = {}
+        for row_number, row in enumerate(wb.active.iter_rows(min_row=min_row, max_row=max_row), start=min_row):
+            cells = {column: (json_value(cell.value), style_colours[cell._style_id])
+                     for column, cell in enumerate(row, start=1) if not isinstance(cell, EmptyCell)}
+            if cells:
+                rows[row_number] = cells
+        return rows
+    finally:
+        wb.close()
+
+def read_rows(file, min_row=1, max_row=None):
+    """Return {row: {column: (value, fill colour)}} for rows min_row..max_row of the active sheet.
+
+    The sheet is streamed and reading stops right after max_row, so a
+    range near the top of a long sheet never parses the rest of it.
+    """
+    try:
+        with XlsxReader(file) as reader:
+            return dict(reader.iter_cells(min_row, max_row))
+    except UnsupportedWorkbook:
+        return read_rows_openpyxl(file, min_row, max_row)
+
+class SheetCache:
+    """Parsed rows of one workbook, kept in a sidecar file under .cache/sheets.
+
+    The sidecar holds every row from the top of the sheet down to the
+    furthest row an inspection has read (the whole sheet once it has been
+    read to the end).  Fill colours are listed once and cells refer to them
+    by index.  Entries are tied to the workbook's SHA-256; a matching size
+    and mtime is trusted without rehashing, as in the extraction cache.
+    """
+
+    def __init__(self, file, cache_dir=SHEET_CACHE_DIR):
+        self.file = file
+        name = os.path.normpath(os.path.relpath(file)).replace(os.sep, '__')
+        self.path = os.path.join(cache_dir, name + '.json')
+
+    def load(self):
+        """Return the sidecar entry if it still matches the workbook, else None"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+        if entry.get('version') != SHEET_CACHE_VERSION:
+            return None
+        stat = os.stat(self.file)
+        if entry['size'] != stat.st_size:
+            return None
+        if entry['mtime'] != stat.st_mtime_ns:
+            if entry['sha256'] != file_sha256(self.file):
+                return None
+            # Touched but unchanged: remember the new mtime so the next lookup skips the hash
+            entry['mtime'] = stat.st_mtime_ns
+            try:
+                self.write(entry)
+            except OSError:
+                pass
+        return entry
+
+    def lookup(self, min_row=1, max_row=None):
+        """Return cached rows min_row..max_row, or None if the sidecar does not cover them"""
+        entry = self.load()
+        if entry is None:
+            return None
+        read_through = entry['readThrough']
+        if read_through is not None and (max_row is None or max_row > read_through):
+            return None
+        fills = entry['fills']
+        rows = {}
+        for row_number, cells in entry['rows']:
+            if row_number < min_row or (max_row is not None and row_number > max_row):
+                continue
+            rows[row_number] = {column: (value, fills[fill]) for column, value, fill in cells}
+        return rows
+
+    def store(self, rows, read_through):
+        """Save rows read from the top of the sheet down to read_through (None = the whole sheet)"""
+        stat = os.stat(self.file)
+        fills = []
+        fill_ids = {}
+        compact_rows = []
+        for row_number, cells in sorted(rows.items()):
+            compact_cells = []
+            for column, (value, fill) in sorted(cells.items()):
+                if fill not in fill_ids:
+                    fill_ids[fill] = len(fills)
+                    fills.append(fill)
+                compact_cells.append([column, value, fill_ids[fill]])
+            compact_rows.append([row_number, compact_cells])
+        entry = {
+            'version': SHEET_CACHE_VERSION,
+            'file': self.file,
+            'size': stat.st_size,
+            'mtime': stat.st_mtime_ns,
+            'sha256': file_sha256(self.file),
+            'readThrough': read_through,
+            'fills': fills,
+            'rows': compact_rows
+        }
+        self.write(entry)
+
+    def write(self, entry):
+        """Replace the sidecar via a temp file"""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        atomic_write(self.path, encode_json(entry, minify=True))
+
+def inspect_rows(file, min_row=1, max_row=None, use_cache=True, cache_dir=SHEET_CACHE_DIR):
+    """Return ({row: {column: (value, fill colour)}}, 'cache' or 'workbook') for rows min_row..max_row"""
+    cache = SheetCache(file, cache_dir) if use_cache else None
+    if cache is not None:
+        rows = cache.lookup(min_row, max_row)
+        if rows is not None:
+            return rows, 'cache'
+        # Read from the top so the sidecar stays a contiguous prefix of the sheet;
+        # the rows above min_row have to be scanned by the stream anyway
+        rows = read_rows(file, 1, max_row)
+        try:
+            cache.store(rows, max_row)
+        except OSError as e:
+            print(f"Warning: could not write {cache.path}: {e}")
+        return {row: cells for row, cells in rows.items() if row >= min_row}, 'workbook'
+    return read_rows(file, min_row, max_row), 'workbook'
+
+def print_rows(rows, min_row, max_row, columns=DEFAULT_COLUMNS):
+    """Print each row's first columns with their values and fill colours"""
+    row_numbers = range(min_row, max_row + 1) if max_row is not None else sorted(rows)
+    for row_number in row_numbers:
+        print(f"\nRow {row_number}:")
+        print("-" * 40)
+        cells = rows.get(row_number, {})
+        for column in range(1, columns + 1):
+            value, fill = cells.get(column, (None, None))
+            # Truncate long values for display
+            text = str(value)
+            display_value = text[:100] + "..." if value and len(text) > 100 else text
+            print(f"  {column_letter(column)}{row_number}: '{display_value}' (fill: {fill})")
+
+def parse_row_range(text):
+    """Parse '95', '95-97' or '95-' (to the end) into (first, last or None)"""
+    first, dash, last = text.partition('-')
+    first = int(first)
+    if not dash:
+        return first, first
+    last = int(last) if last else None
+    if last is not None and last < first:
+        raise argparse.ArgumentTypeError(f"row range {text} ends before it starts")
+    return first, last
+
+def main(argv=None, prog=None):
+    """Print a range of rows of a workbook, reading no further than the range needs"""
+    parser = argparse.ArgumentParser(prog=prog, description="Inspect a row range of a workbook's active sheet")
+    parser.add_argument('file', help="workbook, e.g. public/xlsx/6.4.xlsx")
+    parser.add_argument('--rows', type=parse_row_range, default=(1, 10), metavar='FIRST-LAST',
+                        help="rows to print: '95', '95-97' or '95-' for the rest of the sheet (default: 1-10)")
+    parser.add_argument('--columns', type=int, default=DEFAULT_COLUMNS,
+                        help=f"columns to print, from A (default: {DEFAULT_COLUMNS})")
+    parser.add_argument('--no-cache', action='store_true', help=f"ignore and don't write the {SHEET_CACHE_DIR} sidecar")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.file):
+        print(f"File {args.file} not found!")
+        return
+    min_row, max_row = args.rows
+    start = time.perf_counter()
+    rows, source = inspect_rows(args.file, min_row, max_row, use_cache=not args.no_cache)
+    elapsed = time.perf_counter() - start
+
+    print(f"Rows {min_row}-{max_row or 'end'} of {args.file}")
+    print("=" * 80)
+    print_rows(rows, min_row, max_row, args.columns)
+    print("\n" + "=" * 80)
+    print(f"Read from {source} in {elapsed * 1000:.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,51 @@
-import React, { useState, useEffect, useCallback } from 'react';
+import React, { useState, useEffect, useCallback, useMemo } from 'react';
 import './App.css';
 
+// Section of a question: '1' for 1.4.xlsx, '5' for 5.xlsx
+const questionSection = (question) => question.sourceFile.split('.')[0];
+
+// Unbiased sample of `count` items (partial Fisher-Yates: O(count), not a full sort)
+const sampleQuestions = (items, count) => {
+  const pool = [...items];
+  const size = Math.min(count, pool.length);
+  for (let i = 0; i < size; i++) {
+    const j = i + Math.floor(Math.random() * (pool.length - i));
+    [pool[i], pool[j]] = [pool[j], pool[i]];
+  }
+  return pool.slice(0, size);
+};
+
+// Progress saved before questions had content-hash IDs is keyed by the old
+// integer IDs, which no longer name any question.  Numbers in
+// answeredQuestions and short all-digit question_{id}_correct keys are
+// legacy (hash IDs are 12 hex digits); drop that progress once, together
+// with the global totals, so overall and per-section stats agree again.
+const isLegacyId = (id) => typeof id === 'number' || /^\d{1,11}$/.test(id);
+
+const clearLegacyProgress = () => {
+  let saved = [];
+  try {
+    saved = JSON.parse(localStorage.getItem('answeredQuestions') || '[]');
+  } catch (error) {
+    saved = [];
+  }
+  const legacyKeys = [];
+  for (let i = 0; i < localStorage.length; i++) {
+    const match = (localStorage.key(i) || '').match(/^question_(.+)_correct$/);
+    if (match && isLegacyId(match[1])) {
+      legacyKeys.push(match[0]);
+    }
+  }
+  if (legacyKeys.length === 0 && !saved.some(isLegacyId)) {
+    return;
+  }
+  legacyKeys.forEach(key => localStorage.removeItem(key));
+  localStorage.removeItem('answeredQuestions');
+  localStorage.removeItem('correctAnswers');
+  localStorage.removeItem('totalAnswered');
+  console.log('Cleared progress saved with the old question IDs');
+};
+
 function App() {
   const [questions, setQuestions] = useState([]);
   const [currentQuestion, setCurrentQuestion] = useState(null);
@@ -21,6 +66,20 @@ function App() {
   const [userAnswers, setUserAnswers] = useState({}); // Track user answers in test mode
   const [showWrongAnswers, setShowWrongAnswers] = useState(false); // Toggle to show wrong answers
 
+  // Lookups built once per loaded bank so stats and filtering don't rescan it
+  const questionsById = useMemo(() => new Map(questions.map(q => [q.id, q])), [questions]);
+  const questionsBySection = useMemo(() => {
+    const sections = new Map();
+    questions.forEach(q => {
+      const section = questionSection(q);
+      if (!sections.has(section)) {
+        sections.set(section, []);
+      }
+      sections.get(section).push(q);
+    });
+    return sections;
+  }, [questions]);
+
   const loadQuestions = useCallback(async () => {
     try {
       setLoading(true);
@@ -47,6 +106,7 @@ function App() {
 
   // Load answered questions from localStorage on component mount
   useEffect(() => {
+    clearLegacyProgress();
     const savedAnswered = localStorage.getItem('answeredQuestions');
     const savedCorrect = localStorage.getItem('correctAnswers');
     const savedTotal = localStorage.getItem('totalAnswered');
@@ -81,8 +141,7 @@ function App() {
   }, [testMode, questions, testQuestionsCount]);
 
   const initializeTestMode = () => {
-    const shuffledQuestions = [...questions].sort(() => Math.random() - 0.5);
-    const selectedTestQuestions = shuffledQuestions.slice(0, Math.min(testQuestionsCount, questions.length));
+    const selectedTestQuestions = sampleQuestions(questions, testQuestionsCount);
     setTestQuestions(selectedTestQuestions);
     setCurrentQuestionIndex(0);
     setTestResults(null);
@@ -166,24 +225,22 @@ function App() {
     }
   };
 
-  const getFilteredQuestions = () => {
-    if (selectedSection === 'all') {
+  const getSectionQuestions = (section) => {
+    if (section === 'all') {
       return questions;
     }
-    return questions.filter(q => q.sourceFile.startsWith(selectedSection));
+    return questionsBySection.get(section) || [];
   };
 
   const getSectionStats = () => {
-    const filteredQuestions = getFilteredQuestions();
     const answeredInSection = [...answeredQuestions].filter(id => {
-      const question = questions.find(q => q.id === id);
-      return question && (selectedSection === 'all' || question.sourceFile.startsWith(selectedSection));
+      const question = questionsById.get(id);
+      return question && (selectedSection === 'all' || questionSection(question) === selectedSection);
     });
 
-    const correctInSection = answeredInSection.filter(id => {
-      const question = questions.find(q => q.id === id);
-      return question && localStorage.getItem(`question_${id}_correct`) === 'true';
-    });
+    const correctInSection = answeredInSection.filter(id =>
+      localStorage.getItem(`question_${id}_correct`) === 'true'
+    );
 
     return {
       total: answeredInSection.length,
@@ -226,9 +283,7 @@ function App() {
       }
     } else {
       // Regular mode logic
-      const filteredQuestions = section === 'all'
-        ? questions
-        : questions.filter(q => q.sourceFile.startsWith(section));
+      const filteredQuestions = getSectionQuestions(section);
 
       const unansweredQuestions = filteredQuestions.filter(q => !answeredQuestions.has(q.id));
 
@@ -0,0 +1,87 @@
+import json
+import tempfile
+import unittest
+
+from build_io import encode_json
+from question_extractor import assign_question_ids
+from question_versions import (apply_patch, load_manifest, publish_version, read_patch, read_snapshot,
+                               update_questions, verify_versions)
+
+def make_question(number, correct=0):
+    return {
+        "question": f"Question {number}",
+        "answers": [f"Answer {number}.{answer}" for answer in range(4)],
+        "correctAnswerIndex": correct,
+        "questionGroup": f"Group {number % 3}",
+        "sourceFile": f"{number % 2 + 1}.1.xlsx"
+    }
+
+def make_bank(numbers):
+    questions = [make_question(number) for number in numbers]
+    assign_question_ids(questions)
+    return questions
+
+class PatchChainTest(unittest.TestCase):
+    """Every retained version must patch to the latest build byte for byte"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.versions_dir = self.tmp.name
+        base = make_bank(range(10))
+        # A question added and one removed
+        grown = base[1:] + make_bank([10])
+        # The correct answer of a question changed, ID unchanged
+        regraded = [dict(question) for question in grown]
+        regraded[3]['correctAnswerIndex'] = 2
+        # The same questions in a different order
+        reordered = regraded[5:] + regraded[:5]
+        self.builds = [(base, False), (grown, False), (regraded, False), (reordered, False), (reordered, True)]
+        for questions, minify in self.builds:
+            self.assertIsNotNone(publish_version(questions, self.versions_dir, minify))
+        self.manifest = load_manifest(self.versions_dir)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_manifest_lists_every_build(self):
+        self.assertEqual([entry['version'] for entry in self.manifest['versions']], [1, 2, 3, 4, 5])
+        self.assertTrue(self.manifest['versions'][-1]['minified'])
+
+    def test_unchanged_build_is_not_a_new_version(self):
+        questions, minify = self.builds[-1]
+        self.assertIsNone(publish_version(questions, self.versions_dir, minify))
+
+    def test_direct_patches_reproduce_latest_build(self):
+        expected = read_snapshot(self.versions_dir, self.manifest['latest'])
+        for entry in self.manifest['versions']:
+            questions = json.loads(read_snapshot(self.versions_dir, entry['version']))
+            updated, applied = update_questions(questions, entry['version'], self.versions_dir, self.manifest)
+            self.assertLessEqual(len(applied), 1)
+            self.assertEqual(encode_json(updated, minify=True), expected, f"version {entry['version']}")
+
+    def test_next_patch_chain_reproduces_latest_build(self):
+        expected = read_snapshot(self.versions_dir, self.manifest['latest'])
+        entries = {entry['version']: entry for entry in self.manifest['versions']}
+        for entry in self.manifest['versions']:
+            questions = json.loads(read_snapshot(self.versions_dir, entry['version']))
+            version = entry['version']
+            while version != self.manifest['latest']:
+                patch = read_patch(self.versions_dir, entries[version]['next']['file'])
+                questions = apply_patch(questions, patch)
+                version = patch['to']
+            self.assertEqual(encode_json(questions, minify=True), expected, f"version {entry['version']}")
+
+    def test_patches_record_each_change(self):
+        entries = {entry['version']: entry for entry in self.manifest['versions']}
+        grown = read_patch(self.versions_dir, entries[1]['next']['file'])
+        self.assertEqual((len(grown['added']), len(grown['removed']), grown['modified']), (1, 1, []))
+        regraded = read_patch(self.versions_dir, entries[2]['next']['file'])
+        self.assertEqual([question['correctAnswerIndex'] for question in regraded['modified']], [2])
+        reordered = read_patch(self.versions_dir, entries[3]['next']['file'])
+        self.assertEqual((reordered['added'], reordered['removed'], reordered['modified']), ([], [], []))
+
+    def test_verify_versions_finds_no_problems(self):
+        self.assertEqual(verify_versions(self.versions_dir), [])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,154 @@
+import logging
+import os
+import time
+
+from build_log import log_event
+from process_excel import (CACHE_FILE, EXCEL_DIR, assign_question_ids, extract_questions_from_file,
+                           list_workbooks, load_cache, lookup_cache, save_cache, store_cache, write_outputs)
+
+# Seconds without further changes before a rebuild starts; editors' save
+# operations (temp file, rename, Excel's lock file) arrive as bursts
+DEBOUNCE_SECONDS = 1.0
+POLL_SECONDS = 0.5
+
+def scan_workbooks(excel_dir=EXCEL_DIR):
+    """Return {path: (size, mtime_ns)} for every workbook in excel_dir"""
+    snapshot = {}
+    try:
+        files = list_workbooks(excel_dir)
+    except FileNotFoundError:
+        return snapshot
+    for file in files:
+        try:
+            stat = os.stat(file)
+        except FileNotFoundError:
+            continue
+        snapshot[file] = (stat.st_size, stat.st_mtime_ns)
+    return snapshot
+
+class BankWatcher:
+    """Keep the extracted bank in memory and republish it when workbooks change.
+
+    Each workbook's questions are held separately; a change re-extracts
+    only that workbook, splices its questions back in file name order,
+    reassigns IDs and publishes every output through write_outputs(),
+    which replaces files atomically.
+    """
+
+    def __init__(self, excel_dir=EXCEL_DIR, cache_file=CACHE_FILE, **output_options):
+        self.excel_dir = excel_dir
+        self.cache_file = cache_file
+        self.output_options = output_options
+        self.cache = load_cache(cache_file) if cache_file else None
+        self.results = {}
+        self.snapshot = {}
+
+    def extract(self, file):
+        """Extract one workbook (or take it from the cache) and remember the result"""
+        cached = lookup_cache(self.cache, file) if self.cache is not None else None
+        if cached is not None:
+            self.results[file] = (*cached, None)
+            return False
+        questions, issues, error, _ = extract_questions_from_file(file)
+        previous = self.results.get(file)
+        if error and previous and not previous[2]:
+            # Most likely caught mid-save: keep publishing the last good version
+            log_event(logging.WARNING, 'file_error',
+                      f"  {os.path.basename(file)}: {error} (keeping the previous version)",
+                      file=os.path.basename(file), error=error)
+            return True
+        self.results[file] = (questions, issues, error)
+        if self.cache is not None:
+            if error:
+                self.cache['files'].pop(file, None)
+            else:
+                store_cache(self.cache, file, questions, issues)
+        return True
+
+    def publish(self):
+        """Merge the per-workbook results and write every output; return the question count"""
+        questions = []
+        for file in sorted(self.results):
+            file_questions, _, error = self.results[file]
+            if error:
+                log_event(logging.ERROR, 'file_error', f"  {os.path.basename(file)}: {error}",
+                          file=os.path.basename(file), error=error)
+                continue
+            questions.extend(file_questions)
+        for collision in assign_question_ids(questions):
+            log_event(logging.WARNING, 'id_collision', f"  {collision}")
+        write_outputs(questions, **self.output_options)
+        if self.cache is not None:
+            try:
+                save_cache(self.cache, self.cache_file)
+            except Exception as e:
+                log_event(logging.WARNING, 'cache_error', f"Error saving cache {self.cache_file}: {e}")
+        return len(questions)
+
+    def rebuild(self, changed, removed, first_event=None):
+        """Re-extract changed workbooks, drop removed ones and publish, logging the latency"""
+        start = time.perf_counter()
+        for file in removed:
+            self.results.pop(file, None)
+            if self.cache is not None:
+                self.cache['files'].pop(file, None)
+        extracted = [file for file in sorted(changed) if self.extract(file)]
+        extract_done = time.perf_counter()
+        total = self.publish()
+        end = time.perf_counter()
+
+        names = [os.path.basename(file) for file in sorted(changed | removed)] if first_event else []
+        latency = {"extractMs": round((extract_done - start) * 1000, 1),
+                   "publishMs": round((end - extract_done) * 1000, 1),
+                   "rebuildMs": round((end - start) * 1000, 1)}
+        if first_event is not None:
+            latency["sinceChangeMs"] = round((end - first_event) * 1000, 1)
+        since_change = f", {latency['sinceChangeMs']:.0f} ms since first change" if first_event is not None else ""
+        log_event(logging.INFO, 'rebuild',
+                  f"{'Rebuilt ' + ', '.join(names) if names else 'Built bank'}: {total} questions, re-extracted {len(extracted)}, "
+                  f"extract {latency['extractMs']:.0f} ms, publish {latency['publishMs']:.0f} ms{since_change}",
+                  files=names, questions=total, reextracted=len(extracted), **latency)
+
+    def run(self, debounce=DEBOUNCE_SECONDS, poll=POLL_SECONDS):
+        """Build once, then poll for changes until interrupted"""
+        self.snapshot = scan_workbooks(self.excel_dir)
+        # Workbooks deleted since the last run still have cache entries
+        removed = set(self.cache['files']) - set(self.snapshot) if self.cache is not None else set()
+        self.rebuild(set(self.snapshot), removed)
+        log_event(logging.INFO, 'watch', f"Watching {self.excel_dir} for changes (Ctrl+C to stop)")
+
+        pending_since = None
+        last_change = None
+        seen = self.snapshot
+        while True:
+            time.sleep(poll)
+            current = scan_workbooks(self.excel_dir)
+            now = time.perf_counter()
+            if current != seen:
+                # Still changing: restart the quiet period
+                seen = current
+                last_change = now
+                if pending_since is None:
+                    pending_since = now
+                continue
+            if pending_since is None or now - last_change < debounce:
+                continue
+
+            changed = {file for file, stat in current.items() if self.snapshot.get(file) != stat}
+            removed = set(self.snapshot) - set(current)
+            self.snapshot = current
+            if changed or removed:
+                try:
+                    self.rebuild(changed, removed, pending_since)
+                except Exception as e:
+                    log_event(logging.ERROR, 'rebuild_error', f"Rebuild failed, outputs left unchanged: {e}")
+            pending_since = None
+
+def watch_workbooks(excel_dir=EXCEL_DIR, cache_file=CACHE_FILE, debounce=DEBOUNCE_SECONDS,
+                    poll=POLL_SECONDS, **output_options):
+    """Run the watcher until Ctrl+C; output_options are passed to write_outputs()"""
+    watcher = BankWatcher(excel_dir, cache_file, **output_options)
+    try:
+        watcher.run(debounce, poll)
+    except KeyboardInterrupt:
+        log_event(logging.INFO, 'watch', "\nStopped watching")
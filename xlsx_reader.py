@@ -0,0 +1,345 @@
+import argparse
+import os
+import posixpath
+import time
+import zipfile
+from xml.etree.ElementTree import iterparse, fromstring
+
+from question_extractor import INDEXED_COLOURS
+
+MAIN_NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+REL_NS = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+PACKAGE_REL_NS = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+OFFICE_DOCUMENT = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument'
+WORKSHEET = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet'
+SHARED_STRINGS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/sharedStrings'
+STYLES = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles'
+
+ROW_TAG = f'{MAIN_NS}row'
+CELL_TAG = f'{MAIN_NS}c'
+VALUE_TAG = f'{MAIN_NS}v'
+FORMULA_TAG = f'{MAIN_NS}f'
+INLINE_STRING_TAG = f'{MAIN_NS}is'
+TEXT_TAG = f'{MAIN_NS}t'
+RUN_TAG = f'{MAIN_NS}r'
+DIMENSION_TAG = f'{MAIN_NS}dimension'
+SHARED_STRING_TAG = f'{MAIN_NS}si'
+
+# Columns the extractor reads: B (group title) and E (question/answer text)
+GROUP_COLUMN = 2
+TEXT_COLUMN = 5
+
+class UnsupportedWorkbook(Exception):
+    """Raised for workbook features the direct reader does not handle; use openpyxl instead"""
+
+def element_text(node):
+    """Plain text of a shared or inline string: its <t> plus every rich-text run's <t>"""
+    parts = []
+    plain = node.find(TEXT_TAG)
+    if plain is not None and plain.text:
+        parts.append(plain.text)
+    for run in node.iterfind(RUN_TAG):
+        text = run.findtext(TEXT_TAG)
+        if text:
+            parts.append(text)
+    return ''.join(parts)
+
+def element_colour(node):
+    """Normalize a colour element the way question_extractor.normalize_colour() does"""
+    if node is None:
+        # openpyxl's default Color() is black
+        return 'rgb:000000'
+    if node.get('indexed') is not None:
+        indexed = int(node.get('indexed'))
+        if 0 <= indexed < len(INDEXED_COLOURS):
+            return f"rgb:{INDEXED_COLOURS[indexed]}"
+        return f"indexed:{indexed}"
+    if node.get('theme') is not None:
+        tint = float(node.get('tint', 0))
+        return f"theme:{int(node.get('theme'))}" + (f"{tint:+.2f}" if tint else '')
+    if node.get('auto') is not None:
+        return None
+    return f"rgb:{node.get('rgb', '00000000')[-6:].upper()}"
+
+def column_number(reference):
+    """Column number of a cell reference such as 'E12'"""
+    number = 0
+    for char in reference:
+        if char.isdigit():
+            break
+        number = number * 26 + ord(char.upper()) - 64
+    return number
+
+def cast_number(text):
+    return float(text) if '.' in text or 'E' in text or 'e' in text else int(text)
+
+class XlsxReader:
+    """Stream the active sheet of an .xlsx file without openpyxl's object model.
+
+    Only what the extractor uses is decoded: values of columns B and E, and
+    the fill colour of column E text cells.  Shared strings and the
+    style-to-fill table are read once; the sheet XML is streamed row by row
+    with iterparse.  Rows come out exactly like
+    question_extractor.iter_sheet_rows() produces them from openpyxl,
+    including empty rows for gaps.  Cells needing openpyxl's conversions
+    (shared/array formulas, ISO dates) raise UnsupportedWorkbook.  Numbers
+    styled as dates stay numbers; only text affects extraction.
+    """
+
+    def __init__(self, file):
+        try:
+            self.archive = zipfile.ZipFile(file)
+        except zipfile.BadZipFile as e:
+            raise UnsupportedWorkbook(f"not an .xlsx package: {e}")
+        try:
+            self._find_parts()
+        except UnsupportedWorkbook:
+            self.archive.close()
+            raise
+        except (KeyError, ValueError, SyntaxError) as e:
+            self.archive.close()
+            raise UnsupportedWorkbook(f"unexpected package layout: {e}")
+        self.shared_strings = None
+        self.style_colours = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.archive.close()
+
+    def _relationships(self, part):
+        """Return {id: (type, absolute target)} for a part's .rels file"""
+        folder, name = posixpath.split(part)
+        rels_path = posixpath.join(folder, '_rels', name + '.rels')
+        relationships = {}
+        for rel in fromstring(self.archive.read(rels_path)).iter(f'{PACKAGE_REL_NS}Relationship'):
+            target = rel.get('Target')
+            target = target.lstrip('/') if target.startswith('/') else posixpath.normpath(posixpath.join(folder, target))
+            relationships[rel.get('Id')] = (rel.get('Type'), target)
+        return relationships
+
+    def _find_parts(self):
+        """Locate the workbook, its active worksheet, shared strings and styles"""
+        workbook_part = next(target for kind, target in self._relationships('').values()
+                             if kind == OFFICE_DOCUMENT)
+        workbook = fromstring(self.archive.read(workbook_part))
+        relationships = self._relationships(workbook_part)
+
+        active = 0
+        for view in workbook.iter(f'{MAIN_NS}workbookView'):
+            if view.get('activeTab') is not None:
+                active = int(view.get('activeTab'))
+                break
+        sheets = [sheet.get(f'{REL_NS}id') for sheet in workbook.iter(f'{MAIN_NS}sheet')]
+        if not 0 <= active < len(sheets) or sheets[active] not in relationships:
+            raise UnsupportedWorkbook("active sheet not found")
+        kind, self.sheet_part = relationships[sheets[active]]
+        if kind != WORKSHEET:
+            raise UnsupportedWorkbook("active sheet is not a worksheet")
+
+        parts = {kind: target for kind, target in relationships.values()}
+        self.shared_strings_part = parts.get(SHARED_STRINGS)
+        self.styles_part = parts.get(STYLES)
+
+    def load_shared_strings(self):
+        """Read the shared string table (plain text of every entry)"""
+        strings = []
+        if self.shared_strings_part:
+            with self.archive.open(self.shared_strings_part) as source:
+                for _, node in iterparse(source):
+                    if node.tag == SHARED_STRING_TAG:
+                        # openpyxl drops the escape prefix of a literal '_x' sequence
+                        strings.append(element_text(node).replace('x005F_', ''))
+                        node.clear()
+        self.shared_strings = strings
+        return strings
+
+    def load_style_colours(self):
+        """Map every cell style index (cellXfs) to its normalized fill colour"""
+        colours = []
+        if self.styles_part:
+            styles = fromstring(self.archive.read(self.styles_part))
+            fill_colours = []
+            fills = styles.find(f'{MAIN_NS}fills')
+            for fill in (fills if fills is not None else []):
+                pattern = fill.find(f'{MAIN_NS}patternFill')
+                if pattern is None or pattern.get('patternType') in (None, 'none'):
+                    fill_colours.append(None)
+                else:
+                    fill_colours.append(element_colour(pattern.find(f'{MAIN_NS}fgColor')))
+            cell_xfs = styles.find(f'{MAIN_NS}cellXfs')
+            for xf in (cell_xfs if cell_xfs is not None else []):
+                fill_id = int(xf.get('fillId', 0))
+                colours.append(fill_colours[fill_id] if fill_id < len(fill_colours) else None)
+        self.style_colours = colours
+        return colours
+
+    def cell_value(self, cell):
+        """Decode a cell's value like openpyxl with data_only=False"""
+        formula = cell.find(FORMULA_TAG)
+        if formula is not None:
+            if formula.get('t') in ('shared', 'array', 'dataTable'):
+                raise UnsupportedWorkbook(f"{formula.get('t')} formula in {cell.get('r')}")
+            return '=' + (formula.text or '')
+        data_type = cell.get('t', 'n')
+        if data_type == 'inlineStr':
+            node = cell.find(INLINE_STRING_TAG)
+            return element_text(node) if node is not None else None
+        value = cell.findtext(VALUE_TAG) or None
+        if value is None:
+            return None
+        if data_type == 's':
+            return self.shared_strings[int(value)]
+        if data_type == 'n':
+            return cast_number(value)
+        if data_type == 'b':
+            return bool(int(value))
+        if data_type in ('str', 'e'):
+            return value
+        raise UnsupportedWorkbook(f"cell type {data_type!r} in {cell.get('r')}")
+
+    def iter_rows(self, min_row=2):
+        """Yield (row number, column B value, column E value, column E colour) per row"""
+        if self.shared_strings is None:
+            self.load_shared_strings()
+        if self.style_colours is None:
+            self.load_style_colours()
+        style_colours = self.style_colours
+
+        max_row = None
+        counter = min_row
+        row_counter = 0
+        with self.archive.open(self.sheet_part) as source:
+            for _, node in iterparse(source):
+                tag = node.tag
+                if tag == DIMENSION_TAG:
+                    # openpyxl stops at the last row of the declared dimension
+                    last = node.get('ref', '').split(':')[-1]
+                    digits = ''.join(char for char in last if char.isdigit())
+                    max_row = int(digits) if digits else None
+                    continue
+                if tag != ROW_TAG:
+                    continue
+
+                row_counter = int(node.get('r')) if node.get('r') else row_counter + 1
+                if max_row is not None and row_counter > max_row:
+                    break
+                group_value = text_value = None
+                text_style = 0
+                column = 0
+                for cell in node.iterfind(CELL_TAG):
+                    reference = cell.get('r')
+                    column = column_number(reference) if reference else column + 1
+                    if column == GROUP_COLUMN:
+                        group_value = self.cell_value(cell)
+                    elif column == TEXT_COLUMN:
+                        text_value = self.cell_value(cell)
+                        text_style = int(cell.get('s', 0))
+                node.clear()
+
+                # Rows missing from the XML come out empty, as openpyxl yields them
+                while counter < row_counter:
+                    yield counter, None, None, None
+                    counter += 1
+                if counter == row_counter:
+                    text_colour = None
+                    if isinstance(text_value, str):
+                        text_colour = style_colours[text_style] if text_style < len(style_colours) else None
+                    yield row_counter, group_value, text_value, text_colour
+                    counter += 1
+
+    def iter_cells(self, min_row=1, max_row=None):
+        """Yield (row number, {column number: (value, fill colour)}) for every row holding cells.
+
+        Unlike iter_rows() every column is decoded, empty rows are skipped
+        rather than filled in, and reading stops at the first row past
+        max_row.
+        """
+        if self.shared_strings is None:
+            self.load_shared_strings()
+        if self.style_colours is None:
+            self.load_style_colours()
+        style_colours = self.style_colours
+
+        row_counter = 0
+        with self.archive.open(self.sheet_part) as source:
+            for _, node in iterparse(source):
+                if node.tag != ROW_TAG:
+                    continue
+                row_counter = int(node.get('r')) if node.get('r') else row_counter + 1
+                if max_row is not None and row_counter > max_row:
+                    break
+                if row_counter < min_row:
+                    node.clear()
+                    continue
+                cells = {}
+                column = 0
+                for cell in node.iterfind(CELL_TAG):
+                    reference = cell.get('r')
+                    column = column_number(reference) if reference else column + 1
+                    style = int(cell.get('s', 0))
+                    cells[column] = (self.cell_value(cell), style_colours[style] if style < len(style_colours) else None)
+                node.clear()
+                if cells:
+                    yield row_counter, cells
+
+def compare_readers(file):
+    """Return (identical, fast seconds, openpyxl seconds, first difference) for one workbook"""
+    from question_extractor import iter_sheet_rows, open_workbook
+
+    start = time.perf_counter()
+    with XlsxReader(file) as reader:
+        fast_rows = list(reader.iter_rows())
+    fast_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    wb, style_colours = open_workbook(file)
+    try:
+        openpyxl_rows = list(iter_sheet_rows(wb.active, style_colours))
+    finally:
+        wb.close()
+    openpyxl_time = time.perf_counter() - start
+
+    difference = None
+    if fast_rows != openpyxl_rows:
+        for fast_row, openpyxl_row in zip(fast_rows, openpyxl_rows):
+            if fast_row != openpyxl_row:
+                difference = f"fast {fast_row!r} != openpyxl {openpyxl_row!r}"
+                break
+        else:
+            difference = f"{len(fast_rows)} rows != {len(openpyxl_rows)} rows"
+    return difference is None, fast_time, openpyxl_time, difference
+
+def main():
+    """Check that the direct reader yields exactly openpyxl's rows for every workbook"""
+    parser = argparse.ArgumentParser(description="Verify the direct XLSX reader against openpyxl")
+    parser.add_argument('files', nargs='*', help="workbooks to check (default: every file in public/xlsx)")
+    args = parser.parse_args()
+
+    files = args.files or [os.path.join('public/xlsx', name) for name in sorted(os.listdir('public/xlsx'))
+                           if name.endswith('.xlsx')]
+    mismatches = 0
+    fast_total = openpyxl_total = 0.0
+    for file in files:
+        try:
+            identical, fast_time, openpyxl_time, difference = compare_readers(file)
+        except UnsupportedWorkbook as e:
+            print(f"  {os.path.basename(file)}: unsupported ({e}), openpyxl is used")
+            continue
+        fast_total += fast_time
+        openpyxl_total += openpyxl_time
+        status = "identical" if identical else f"DIFFERENT: {difference}"
+        print(f"  {os.path.basename(file):<12} {fast_time * 1000:>8.1f} ms {openpyxl_time * 1000:>8.1f} ms  {status}")
+        mismatches += not identical
+    speedup = f" ({openpyxl_total / fast_total:.1f}x)" if fast_total else ""
+    print(f"Direct reader {fast_total * 1000:.0f} ms, openpyxl {openpyxl_total * 1000:.0f} ms{speedup}")
+    print(f"{len(files) - mismatches} of {len(files)} workbooks identical")
+    if mismatches:
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()